@@ -1019,17 +1019,19 @@ def _apply_safe_fixes(results_dir: Path | None = None) -> list[CheckResult]:
     if not ai_config.exists():
         try:
             ai_config.parent.mkdir(parents=True, exist_ok=True)
-            ai_config.write_text(
-                "# kast AI adapter configuration. Add your API key below to enable\n"
-                "# `kast scan --ai-summary`. Either KAST_AI_API_KEY env var or this\n"
-                "# file is required; env var takes precedence.\n"
-                "provider: anthropic\n"
-                "api_key: \"\"  # paste sk-ant-... here, or leave empty and use the env var\n"
-                "model: claude-sonnet-4-6\n"
-                "# base_url: \"\"  # optional: override the Anthropic API endpoint\n"
-                "#              # e.g. https://api.iq.cudasvc.com (KAST_AI_BASE_URL env var also works)\n"
-            )
-            ai_config.chmod(0o600)
+            # Create with mode 600 so the key file is never briefly world-readable.
+            fd = os.open(ai_config, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+            with os.fdopen(fd, "w") as f:
+                f.write(
+                    "# kast AI adapter configuration. Add your API key below to enable\n"
+                    "# `kast scan --ai-summary`. Either KAST_AI_API_KEY env var or this\n"
+                    "# file is required; env var takes precedence.\n"
+                    "provider: anthropic\n"
+                    "api_key: \"\"  # paste sk-ant-... here, or leave empty and use the env var\n"
+                    "model: claude-sonnet-4-6\n"
+                    "# base_url: \"\"  # optional: override the Anthropic API endpoint\n"
+                    "#              # e.g. https://api.iq.cudasvc.com (KAST_AI_BASE_URL env var also works)\n"
+                )
             fixes.append(CheckResult(section=section, name="AI config template",
                                      status=OK,
                                      detail=f"scaffolded {ai_config} (mode 600)"))
@@ -18,6 +18,7 @@ from __future__ import annotations
 
 import json
 import os
+from collections.abc import Iterable
 from pathlib import Path
 from typing import Any, Union
 
@@ -58,3 +59,34 @@ def write_json_atomic(path: PathLike, data: Any, **dump_kwargs: Any) -> None:
         except (FileNotFoundError, OSError):
             pass
         raise
+
+
+def write_bytes_atomic(path: PathLike, chunks: Iterable[bytes]) -> None:
+    """Stream ``chunks`` to ``path`` atomically.
+
+    Same ``<path>.tmp`` + ``os.replace`` contract as :func:`write_json_atomic`,
+    for payloads that arrive already serialized (e.g. an HTTP response body)
+    and should not be held in memory or re-encoded.
+
+    :param path: Destination path.
+    :param chunks: Iterable of byte strings, written in order.
+
+    :raises OSError: If the file cannot be written or replaced.
+
+    Exceptions raised while iterating ``chunks`` propagate after the temporary
+    file is removed, leaving any existing target untouched.
+    """
+    path = Path(path)
+    tmp = Path(f"{path}.tmp")
+
+    try:
+        with open(tmp, "wb") as f:
+            for chunk in chunks:
+                f.write(chunk)
+        os.replace(tmp, path)
+    except Exception:
+        try:
+            tmp.unlink()
+        except (FileNotFoundError, OSError):
+            pass
+        raise
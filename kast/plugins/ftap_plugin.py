@@ -9,6 +9,7 @@ import re
 import shutil
 import subprocess
 from datetime import UTC, datetime
+from functools import lru_cache
 from pprint import pformat
 
 from kast.core.atomic import write_json_atomic
@@ -77,6 +78,68 @@ LOGIN_PROBE_PATHS = [
     "/my-portal",
 ]
 
+
+_EXPORT_FILENAMES = {"json": "ftap.json", "html": "ftap.html", "csv": "ftap.csv"}
+
+
+def _output_filename(export_format):
+    """Name of the file ftap writes for ``export_format`` (txt for anything else)."""
+    return _EXPORT_FILENAMES.get(export_format, "ftap.txt")
+
+
+@lru_cache(maxsize=128)
+def _cached_command(target, output_dir, detection_mode, export_format, wordlist_path,
+                    update_wordlist, wordlist_source, machine_learning, fuzzing, http3,
+                    concurrency, interactive):
+    """
+    Build the ftap argv for one configuration.
+
+    Shared by run() and get_dry_run_info() so the executed and reported
+    commands cannot drift apart. Cached because multi-target scans and
+    dry runs rebuild the same command repeatedly; the result is a tuple
+    so cached entries cannot be mutated by callers.
+    """
+    cmd = ["ftap", "--url", target]
+
+    # Add detection mode
+    cmd.extend(["--detection-mode", detection_mode])
+
+    # Add output directory and format
+    cmd.extend(["-d", output_dir])
+    cmd.extend(["-e", export_format])
+    cmd.extend(["-f", _output_filename(export_format)])
+
+    # Add wordlist if specified
+    if wordlist_path:
+        cmd.extend(["-w", wordlist_path])
+
+    # Add wordlist update if enabled
+    if update_wordlist:
+        cmd.append("--update-wordlist")
+        if wordlist_source:
+            cmd.extend(["--source", wordlist_source])
+
+    # Add advanced features
+    if machine_learning:
+        cmd.append("--machine-learning")
+
+    if fuzzing:
+        cmd.append("--fuzzing")
+
+    if http3:
+        cmd.append("--http3")
+
+    # Add concurrency if specified
+    if concurrency is not None:
+        cmd.extend(["--concurrency", str(concurrency)])
+
+    # Add interactive mode if enabled
+    if interactive:
+        cmd.append("-i")
+
+    return tuple(cmd)
+
+
 class FtapPlugin(KastPlugin):
     priority = 50  # Set plugin run order (lower runs earlier)
 
@@ -227,56 +290,11 @@ class FtapPlugin(KastPlugin):
         self.setup(target, output_dir)
         timestamp = datetime.now(UTC).isoformat(timespec="milliseconds")
 
-        # Determine output filename based on export format
-        if self.export_format == "json":
-            output_filename = "ftap.json"
-        elif self.export_format == "html":
-            output_filename = "ftap.html"
-        elif self.export_format == "csv":
-            output_filename = "ftap.csv"
-        else:  # txt
-            output_filename = "ftap.txt"
-
+        output_filename = _output_filename(self.export_format)
         output_file = os.path.join(output_dir, output_filename)
 
         # Build command dynamically based on configuration
-        cmd = ["ftap", "--url", target]
-
-        # Add detection mode
-        cmd.extend(["--detection-mode", self.detection_mode])
-
-        # Add output directory and format
-        cmd.extend(["-d", str(output_dir)])
-        cmd.extend(["-e", self.export_format])
-        cmd.extend(["-f", output_filename])
-
-        # Add wordlist if specified
-        if self.wordlist_path:
-            cmd.extend(["-w", self.wordlist_path])
-
-        # Add wordlist update if enabled
-        if self.update_wordlist:
-            cmd.append("--update-wordlist")
-            if self.wordlist_source:
-                cmd.extend(["--source", self.wordlist_source])
-
-        # Add advanced features
-        if self.machine_learning:
-            cmd.append("--machine-learning")
-
-        if self.fuzzing:
-            cmd.append("--fuzzing")
-
-        if self.http3:
-            cmd.append("--http3")
-
-        # Add concurrency if specified
-        if self.concurrency is not None:
-            cmd.extend(["--concurrency", str(self.concurrency)])
-
-        # Add interactive mode if enabled
-        if self.interactive:
-            cmd.append("-i")
+        cmd = list(self._build_command(target, output_dir))
 
         # Store command for reporting
         self.command_executed = ' '.join(cmd)
@@ -1035,59 +1053,22 @@ class FtapPlugin(KastPlugin):
         self.debug(f"Login portal probe complete: {len(found)} finding(s) saved to {login_path}")
         return found
 
+    def _build_command(self, target, output_dir):
+        """Return the ftap argv for ``target`` under the current configuration."""
+        return _cached_command(
+            target, str(output_dir), self.detection_mode, self.export_format,
+            self.wordlist_path, self.update_wordlist, self.wordlist_source,
+            self.machine_learning, self.fuzzing, self.http3, self.concurrency,
+            self.interactive,
+        )
+
     def get_dry_run_info(self, target, output_dir):
         """
         Return information about what this plugin would do in a real run.
         Builds command using current configuration.
         """
-        # Determine output filename based on export format
-        if self.export_format == "json":
-            output_filename = "ftap.json"
-        elif self.export_format == "html":
-            output_filename = "ftap.html"
-        elif self.export_format == "csv":
-            output_filename = "ftap.csv"
-        else:  # txt
-            output_filename = "ftap.txt"
-
         # Build command dynamically based on configuration
-        cmd = ["ftap", "--url", target]
-
-        # Add detection mode
-        cmd.extend(["--detection-mode", self.detection_mode])
-
-        # Add output directory and format
-        cmd.extend(["-d", str(output_dir)])
-        cmd.extend(["-e", self.export_format])
-        cmd.extend(["-f", output_filename])
-
-        # Add wordlist if specified
-        if self.wordlist_path:
-            cmd.extend(["-w", self.wordlist_path])
-
-        # Add wordlist update if enabled
-        if self.update_wordlist:
-            cmd.append("--update-wordlist")
-            if self.wordlist_source:
-                cmd.extend(["--source", self.wordlist_source])
-
-        # Add advanced features
-        if self.machine_learning:
-            cmd.append("--machine-learning")
-
-        if self.fuzzing:
-            cmd.append("--fuzzing")
-
-        if self.http3:
-            cmd.append("--http3")
-
-        # Add concurrency if specified
-        if self.concurrency is not None:
-            cmd.extend(["--concurrency", str(self.concurrency)])
-
-        # Add interactive mode if enabled
-        if self.interactive:
-            cmd.append("-i")
+        cmd = self._build_command(target, output_dir)
 
         # Build operations description
         operations = f"Scan for admin panels using {self.detection_mode} mode"
@@ -5,14 +5,22 @@ Description: KAST plugin for OWASP ZAP with multi-mode support (local, remote)
 
 import json
 import os
+import shutil
+import traceback
 from datetime import UTC, datetime
 from pathlib import Path
+from urllib.parse import urlparse
 
 import yaml
 
 from kast.core.atomic import write_json_atomic
 from kast.plugins.base import KastPlugin
-from kast.scripts.zap_providers import LocalZapProvider, RemoteZapProvider
+from kast.scripts.zap_providers import (
+    PROVIDERS_BY_MODE,
+    LocalZapProvider,
+    RemoteZapProvider,
+    render_automation_plan,
+)
 
 # Substrings (lowercase) that indicate a WAF can address the finding.
 # Checked against the alert name with case-insensitive substring match.
@@ -271,8 +279,6 @@ class ZapPlugin(KastPlugin):
         remote mode config is provided. Always returns True since remote mode
         requires no local tool.
         """
-        import shutil
-
         # Check for Docker (local mode)
         if shutil.which("docker") is not None:
             return True
@@ -514,8 +520,6 @@ class ZapPlugin(KastPlugin):
         :param target: Target URL (may or may not have scheme)
         :return: Normalized URL with scheme
         """
-        from urllib.parse import urlparse
-
         parsed = urlparse(target)
 
         # If scheme already present, use as-is (respects user's explicit choice)
@@ -801,19 +805,8 @@ class ZapPlugin(KastPlugin):
                     self.debug("Remote mode: No API key provided")
 
             # Select provider based on execution mode
-            _mode = self.config.get('execution_mode', 'auto')
-            if _mode == 'remote':
-                self.provider = RemoteZapProvider(self.config, self.debug)
-            elif _mode == 'auto':
-                _auto_cfg = self.config.get('auto_discovery', {})
-                if _auto_cfg.get('check_env_vars', True) and os.environ.get('KAST_ZAP_URL'):
-                    self.debug("Auto-discovery: Using remote mode (KAST_ZAP_URL found)")
-                    self.provider = RemoteZapProvider(self.config, self.debug)
-                else:
-                    self.debug("Auto-discovery: Using local mode")
-                    self.provider = LocalZapProvider(self.config, self.debug)
-            else:
-                self.provider = LocalZapProvider(self.config, self.debug)
+            provider_cls = self._select_provider_class(self.config.get('execution_mode', 'auto'))
+            self.provider = provider_cls(self.config, self.debug)
 
             provider_mode = self.provider.get_mode_name()
             self.debug(f"Using {provider_mode} provider for ZAP scan")
@@ -864,7 +857,7 @@ class ZapPlugin(KastPlugin):
                 automation_plan = self._inject_spider_type(automation_plan, self._spider_used)
 
                 # Substitute target URL in the plan
-                plan_with_target = automation_plan.replace('${TARGET_URL}', target)
+                plan_with_target = render_automation_plan(automation_plan, target)
 
                 # Write the plan to output directory BEFORE uploading
                 plan_output_path = os.path.join(output_dir, 'zap_automation_plan.yaml')
@@ -960,11 +953,28 @@ class ZapPlugin(KastPlugin):
 
         except Exception as e:
             self.debug(f"ZAP plugin failed: {e}")
-            import traceback
             self.debug(traceback.format_exc())
             self._cleanup_on_failure()
             return self.get_result_dict("fail", str(e), timestamp)
 
+    def _select_provider_class(self, execution_mode):
+        """
+        Resolve the provider class for an execution mode
+
+        Explicit modes dispatch through PROVIDERS_BY_MODE; 'auto' picks remote
+        when KAST_ZAP_URL is set, and anything else falls back to local.
+        """
+        provider_cls = PROVIDERS_BY_MODE.get(execution_mode)
+        if provider_cls is not None:
+            return provider_cls
+        if execution_mode == 'auto':
+            auto_cfg = self.config.get('auto_discovery', {})
+            if auto_cfg.get('check_env_vars', True) and os.environ.get('KAST_ZAP_URL'):
+                self.debug("Auto-discovery: Using remote mode (KAST_ZAP_URL found)")
+                return RemoteZapProvider
+            self.debug("Auto-discovery: Using local mode")
+        return LocalZapProvider
+
     def _run_api_scan(self, target):
         """
         Run ZAP scan using direct API calls (for remote/local without automation)
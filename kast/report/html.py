@@ -89,7 +89,10 @@ def _copy_logo_to_output(logo_path, output_dir):
 
 
 def render_html(report_data, output_path, logo_path=None):
-    """Render the HTML report from already-collected report data."""
+    """Render the HTML report from already-collected report data.
+
+    Returns the rendered HTML that was written to ``output_path``.
+    """
     template = _env.get_template("report_template.html")
     plugin_summaries, detailed_results, executive_summary = _format_for_html(report_data)
 
@@ -120,13 +123,15 @@ def render_html(report_data, output_path, logo_path=None):
             report_data["missing_issues"], output_dir, report_data["target"]
         )
 
+    return html_content
+
 
 def generate_html_report(
     plugin_results, output_path="kast_report.html", target=None, logo_path=None,
     ai_summary=None, ai_error=None,
 ):
-    """One-shot entrypoint: collect data then render HTML."""
+    """One-shot entrypoint: collect data then render HTML; returns the HTML."""
     data = collect_report_data(
         plugin_results, target, ai_summary=ai_summary, ai_error=ai_error,
     )
-    render_html(data, output_path, logo_path)
+    return render_html(data, output_path, logo_path)
@@ -5,17 +5,21 @@ Handles interaction with OWASP ZAP REST API
 
 import json
 import time
-from datetime import UTC
+from datetime import UTC, datetime
+from io import BytesIO
 from pathlib import Path
 
 import requests
+from requests.adapters import HTTPAdapter
 
-from kast.core.atomic import write_json_atomic
+from kast.core.atomic import write_bytes_atomic, write_json_atomic
 
 
 class ZAPAPIClient:
     """Client for interacting with OWASP ZAP REST API"""
 
+    _VERSION_ENDPOINT = '/JSON/core/view/version/'
+
     def __init__(self, api_url, api_key=None, timeout=30, debug_callback=None):
         """
         Initialize ZAP API client
@@ -28,8 +32,19 @@ class ZAPAPIClient:
         self.api_url = api_url.rstrip('/')
         self.api_key = api_key
         self.timeout = timeout
-        self.debug = debug_callback or (lambda x: None)
+        self.debug = debug_callback
         self.session = requests.Session()
+        # No automatic retries: urllib3 reports a dropped keep-alive as a read
+        # error, and retrying reads would also replay POSTs and double the wait
+        # on a hung ZAP. Callers that need another attempt poll instead.
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16, max_retries=0)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        # Readiness/version probes (check_connection, probe_ready_once,
+        # get_version) all hit this endpoint; requests picks the adapter with
+        # the longest matching prefix, so they keep exactly one attempt even if
+        # the shared adapter's retry policy changes.
+        self.session.mount(f'http://zap{self._VERSION_ENDPOINT}', HTTPAdapter(max_retries=0))
         # ZAP 2.14+ (ExtensionNetwork) serves its API at http://zap/ through the proxy
         # rather than directly at the proxy port. Route all requests through ZAP.
         self.session.proxies = {'http': self.api_url, 'https': self.api_url}
@@ -38,7 +53,23 @@ class ZAPAPIClient:
         if self.api_key:
             self.session.params = {'apikey': self.api_key}
 
-    def _make_request(self, endpoint, method='GET', params=None, data=None, files=None):
+    @property
+    def debug(self):
+        """Debug callback (a no-op when none is set)"""
+        return self._debug
+
+    @debug.setter
+    def debug(self, callback):
+        # _debug_enabled lets hot paths skip formatting messages nobody reads.
+        self._debug = callback or (lambda x: None)
+        self._debug_enabled = callback is not None
+
+    def close(self):
+        """Release pooled connections (the client reconnects if used again)"""
+        self.session.close()
+
+    def _make_request(self, endpoint, method='GET', params=None, data=None, files=None,
+                      timeout=None):
         """
         Make HTTP request to ZAP API
 
@@ -47,12 +78,14 @@ class ZAPAPIClient:
         :param params: Query parameters
         :param data: Request body data
         :param files: Files to upload
+        :param timeout: Request timeout in seconds (defaults to the client timeout)
         :return: Response JSON or None
         """
         url = f"http://zap{endpoint}"
 
         try:
-            self.debug(f"ZAP API request: {method} {self.api_url}{endpoint}")
+            if self._debug_enabled:
+                self.debug(f"ZAP API request: {method} {self.api_url}{endpoint}")
 
             # Prepare headers
             headers = {}
@@ -74,7 +107,7 @@ class ZAPAPIClient:
                 data=data,
                 files=files,
                 headers=headers,
-                timeout=self.timeout
+                timeout=timeout or self.timeout
             )
 
             response.raise_for_status()
@@ -82,10 +115,12 @@ class ZAPAPIClient:
             # Try to parse JSON response
             try:
                 result = response.json()
-                self.debug(f"ZAP API response: {str(result)[:200]}")
+                if self._debug_enabled:
+                    self.debug(f"ZAP API response: {str(result)[:200]}")
                 return result
             except json.JSONDecodeError:
-                self.debug(f"Non-JSON response: {response.text[:200]}")
+                if self._debug_enabled:
+                    self.debug(f"Non-JSON response: {response.text[:200]}")
                 return {'text': response.text}
 
         except requests.exceptions.RequestException as e:
@@ -99,13 +134,26 @@ class ZAPAPIClient:
         :return: True if accessible, False otherwise
         """
         try:
-            result = self._make_request('/JSON/core/view/version/')
+            result = self._make_request(self._VERSION_ENDPOINT)
             self.debug(f"ZAP version: {result.get('version', 'unknown')}")
             return True
         except Exception as e:
             self.debug(f"Connection check failed: {e}")
             return False
 
+    def probe_ready_once(self, timeout=1):
+        """
+        Single readiness check with a short timeout and no retry
+
+        :param timeout: Request timeout in seconds
+        :return: True if the API answered, False otherwise
+        """
+        try:
+            self._make_request(self._VERSION_ENDPOINT, timeout=timeout)
+            return True
+        except Exception:
+            return False
+
     def get_version(self):
         """
         Get ZAP version information with detailed error reporting
@@ -113,7 +161,7 @@ class ZAPAPIClient:
         :return: Tuple of (success: bool, version: str, error_msg: str)
         """
         try:
-            result = self._make_request('/JSON/core/view/version/')
+            result = self._make_request(self._VERSION_ENDPOINT)
             if result and 'version' in result:
                 version = result.get('version', 'unknown')
                 return True, version, None
@@ -151,58 +199,33 @@ class ZAPAPIClient:
             self.debug(f"Session reset failed (non-fatal): {e}")
             return False
 
-    def wait_for_ready(self, timeout=300, poll_interval=10):
+    def wait_for_ready(self, timeout=300, poll_interval=10, initial_interval=0.1):
         """
         Wait for ZAP to be ready
 
+        Polls with exponential backoff starting at ``initial_interval`` and
+        capped at ``poll_interval``, so a fast boot is noticed within a few
+        hundred milliseconds instead of on the next fixed tick.
+
         :param timeout: Maximum wait time in seconds
-        :param poll_interval: Seconds between checks
+        :param poll_interval: Maximum seconds between checks
+        :param initial_interval: Seconds before the first retry
         :return: True if ready, False if timeout
         """
         self.debug(f"Waiting for ZAP to be ready (timeout: {timeout}s)")
 
-        start_time = time.time()
-        while time.time() - start_time < timeout:
+        deadline = time.monotonic() + timeout
+        delay = min(initial_interval, poll_interval)
+        while time.monotonic() < deadline:
             if self.check_connection():
                 self.debug("ZAP is ready")
                 return True
-            time.sleep(poll_interval)
+            time.sleep(max(0, min(delay, deadline - time.monotonic())))
+            delay = min(delay * 1.8, poll_interval)
 
         self.debug("Timeout waiting for ZAP")
         return False
 
-    def upload_automation_plan(self, plan_path, remote_plan_path='/zap/config/automation_plan.yaml'):
-        """
-        Upload automation framework plan to ZAP
-        Note: This requires SSH access, not API. This is a placeholder.
-
-        :param plan_path: Local path to automation plan
-        :param remote_plan_path: Remote path where plan will be uploaded
-        :return: Remote path
-        """
-        # This method is informational - actual upload happens via SSH
-        self.debug(f"Automation plan will be uploaded to: {remote_plan_path}")
-        return remote_plan_path
-
-    def start_automation_scan(self, plan_path, target_url):
-        """
-        Start ZAP automation framework scan
-        Note: This typically requires running ZAP with the -autorun flag
-
-        :param plan_path: Path to automation plan YAML
-        :param target_url: Target URL to scan
-        :return: Scan information
-        """
-        # The automation framework is typically started via command line, not API
-        # This method documents the expected behavior
-        self.debug(f"Starting automation scan for {target_url}")
-
-        return {
-            'plan_path': plan_path,
-            'target_url': target_url,
-            'status': 'started'
-        }
-
     def get_scan_status(self):
         """
         Get current scan status
@@ -275,6 +298,34 @@ class ZAPAPIClient:
         self.debug("Timeout waiting for scan completion")
         return False
 
+    def upload_file(self, content, file_name):
+        """
+        Upload a file into ZAP's home directory (requires api.filexfer=true)
+
+        :param content: File contents as bytes
+        :param file_name: Target filename on the ZAP server
+        :return: Response dict with the 'Uploaded' server path
+        """
+        return self._make_request(
+            '/OTHER/core/other/fileUpload/',
+            method='POST',
+            files={'fileContents': (file_name, BytesIO(content), 'application/octet-stream')},
+            data={'fileName': file_name},
+        )
+
+    def run_automation_plan(self, file_path):
+        """
+        Start an automation plan that is already on the ZAP server
+
+        :param file_path: Server-side path of the plan file
+        :return: Response dict with 'planId' on success
+        """
+        return self._make_request(
+            '/JSON/automation/action/runPlan/',
+            method='POST',
+            data={'filePath': file_path},
+        )
+
     def get_plan_progress(self, plan_id):
         """
         Get automation plan progress
@@ -292,14 +343,20 @@ class ZAPAPIClient:
             self.debug(f"Failed to get plan progress: {e}")
             return None
 
-    def wait_for_plan_completion(self, plan_id, timeout=3600, poll_interval=30, output_dir=None):
+    def wait_for_plan_completion(self, plan_id, timeout=3600, poll_interval=30, output_dir=None,
+                                 initial_interval=0.5):
         """
         Poll automation plan progress until completion or timeout
 
+        Polls back off by 1.5x from ``initial_interval`` up to ``poll_interval``,
+        so short plans are noticed as soon as they finish. Stall detection still
+        runs at most once per ``poll_interval`` of waiting.
+
         :param plan_id: Plan ID to monitor
         :param timeout: Maximum wait time in seconds
-        :param poll_interval: Seconds between status checks
+        :param poll_interval: Maximum seconds between status checks
         :param output_dir: Optional output directory to write progress snapshots
+        :param initial_interval: Seconds before the second status check
         :return: Tuple of (success: bool, final_progress: dict)
         """
         self.debug(f"Waiting for plan {plan_id} completion (timeout: {timeout}s, poll: {poll_interval}s)")
@@ -311,14 +368,17 @@ class ZAPAPIClient:
         last_info_count = 0
         scan_start_time = None
         stalled_cycles = 0
-        last_ascan_pct = None
+        delay = min(initial_interval, poll_interval)
+        stall_wait = 0.0
 
         while time.time() - start_time < timeout:
             progress = self.get_plan_progress(plan_id)
 
             if not progress:
                 self.debug("Warning: Could not get plan progress")
-                time.sleep(poll_interval)
+                time.sleep(delay)
+                stall_wait += delay
+                delay = min(delay * 1.5, poll_interval)
                 continue
 
             # Capture start time from first progress response
@@ -368,6 +428,7 @@ class ZAPAPIClient:
                     self.debug(f"  Progress: {msg}")
                 last_info_count = len(info)
                 stalled_cycles = 0
+                stall_wait = 0.0
             else:
                 # Info list didn't grow — check for a silently crashed automation thread.
                 # If the last message ends with "started", a job began but never finished.
@@ -381,7 +442,8 @@ class ZAPAPIClient:
                         # returns HTTP 400. Neither endpoint is a valid liveness signal here;
                         # rely on the caller-supplied timeout to catch genuine crashes.
                         stalled_cycles = 0
-                    else:
+                    elif stall_wait >= poll_interval:
+                        stall_wait = 0.0
                         # For all other silent jobs (e.g. activeScan), check whether the
                         # active scanner is still making progress before counting a stall.
                         ascan_pct = None
@@ -405,8 +467,6 @@ class ZAPAPIClient:
                                 self._try_cancel_plan(plan_id)
                                 return False, progress
 
-                        last_ascan_pct = ascan_pct
-
             # Check for warnings
             warnings = progress.get('warn', [])
             if warnings:
@@ -415,7 +475,9 @@ class ZAPAPIClient:
 
             elapsed = int(time.time() - start_time)
             self.debug(f"Plan still running... ({elapsed}s elapsed, {len(info)} updates)")
-            time.sleep(poll_interval)
+            time.sleep(delay)
+            stall_wait += delay
+            delay = min(delay * 1.5, poll_interval)
 
         self.debug(f"Timeout waiting for plan {plan_id} completion")
         return False, None
@@ -444,6 +506,27 @@ class ZAPAPIClient:
                 "before the next scan."
             )
 
+    def download_json_report(self, output_path, chunk_size=65536):
+        """
+        Stream ZAP's JSON report straight to disk
+
+        The body is written in chunks as it arrives, without being parsed or
+        re-serialized, so memory stays flat for large reports.
+
+        :param output_path: Path to save report
+        :param chunk_size: Bytes per read from the response
+        :return: Path to saved report
+        """
+        self.debug("Streaming JSON report from ZAP...")
+        output_path = Path(output_path)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        with self.session.get('http://zap/OTHER/core/other/jsonreport/',
+                              stream=True, timeout=self.timeout) as response:
+            response.raise_for_status()
+            write_bytes_atomic(output_path, response.iter_content(chunk_size=chunk_size))
+        self.debug(f"JSON report saved to {output_path}")
+        return str(output_path)
+
     def get_json_report(self):
         """
         Download JSON report from ZAP using the jsonreport endpoint
@@ -559,7 +642,7 @@ class ZAPAPIClient:
         :return: Dictionary with ZAP info
         """
         try:
-            version = self._make_request('/JSON/core/view/version/')
+            version = self._make_request(self._VERSION_ENDPOINT)
             alerts_summary = self._make_request('/JSON/core/view/alertsSummary/')
 
             return {
@@ -582,8 +665,6 @@ class ZAPAPIClient:
         :param final: Whether this is the final snapshot
         """
         try:
-            from datetime import datetime
-
             # Collect additional metrics (with error handling for each)
             alerts_summary = {}
             num_alerts = 0
@@ -3,17 +3,325 @@ ZAP Instance Provider Abstraction
 Supports local and remote execution modes.
 """
 
+import errno
+import hashlib
+import http.client
+import json
 import os
+import re
+import select
+import selectors
+import socket
 import subprocess
+import threading
+import time
+import traceback
 from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, fields
+from functools import lru_cache
 from pathlib import Path
+from urllib.parse import quote
 
 from kast.scripts.zap_api_client import ZAPAPIClient
 
+_PLACEHOLDER_RE = re.compile(r'\$\{(\w+)\}')
+
+
+@lru_cache(maxsize=8)
+def _split_plan(plan_content):
+    # Alternating literal text and placeholder names: [text, name, text, ...]
+    return tuple(_PLACEHOLDER_RE.split(plan_content))
+
+
+def substitute_plan_variables(plan_content, variables):
+    """
+    Substitute ${NAME} placeholders in an automation plan in a single pass
+
+    The plan is tokenized once and cached, so re-rendering the same plan with
+    other values is a single join. Placeholders without a value are kept as-is.
+
+    :param plan_content: YAML content of automation plan
+    :param variables: Mapping of placeholder name to value
+    :return: Plan content with known placeholders replaced
+    """
+    parts = list(_split_plan(plan_content))
+    for i in range(1, len(parts), 2):
+        name = parts[i]
+        parts[i] = variables[name] if name in variables else f'${{{name}}}'
+    return ''.join(parts)
+
+
+def render_automation_plan(plan_content, target_url):
+    """
+    Substitute the target URL into an automation plan
+
+    :param plan_content: YAML content of automation plan
+    :param target_url: Target URL to scan
+    :return: Plan content with every ${TARGET_URL} replaced
+    """
+    return substitute_plan_variables(plan_content, {'TARGET_URL': target_url})
+
+# Docker probe results shared by every LocalZapProvider in the process. A
+# successful availability check is memoized for the process lifetime (a
+# failure is retried, since the daemon may come up later); the running
+# container lookup only for a short TTL since containers come and go. Probes
+# run outside _docker_cache_lock, which only guards publishing results.
+_CONTAINER_CACHE_TTL = 2.0
+_docker_available = None
+_running_container = None
+_known_container = None  # (id, name) of the container kast last found or started
+_docker_cache_lock = threading.Lock()
+
+_ZAP_CONTAINER_LABEL = 'kast-zap'
+_ZAP_CONTAINER_FILTERS = (
+    ('label', f'{_ZAP_CONTAINER_LABEL}=1'),
+    ('ancestor', 'ghcr.io/zaproxy/zaproxy'),
+)
+
+
+def invalidate_docker_cache():
+    """Forget the cached running-container lookup (call after starting/stopping containers)."""
+    global _running_container
+    with _docker_cache_lock:
+        _running_container = None
+
+
+def _remember_container(container):
+    """Record the (id, name) of a container kast is using, or None to forget it."""
+    global _known_container
+    with _docker_cache_lock:
+        _known_container = container
+
+
+class _UnixHTTPConnection(http.client.HTTPConnection):
+    """HTTPConnection over a UNIX domain socket"""
+
+    def __init__(self, socket_path, timeout):
+        super().__init__('localhost', timeout=timeout)
+        self.socket_path = socket_path
+
+    def connect(self):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(self.timeout)
+        self.sock.connect(self.socket_path)
+
+
+class _DockerSocket:
+    """
+    Minimal Docker Engine API client over the daemon's UNIX socket
+
+    Talks to the daemon directly instead of spawning the docker CLI for every
+    query. The connection is opened lazily and kept alive between calls.
+    """
+
+    def __init__(self, socket_path, timeout=30):
+        self.socket_path = socket_path
+        self.timeout = timeout
+        self._conn = None
+        self._lock = threading.Lock()
+
+    def request(self, method, path, body=None, decode=True):
+        """
+        Send a request to the Engine API
+
+        :param method: HTTP method
+        :param path: API path including any query string
+        :param body: Optional JSON-serializable request body
+        :param decode: Decode JSON responses (False for streamed JSON-lines bodies)
+        :return: Tuple of (status, decoded JSON body or raw bytes)
+        :raises OSError: If the socket is unreachable or the request times out
+        """
+        payload = json.dumps(body).encode('utf-8') if body is not None else None
+        headers = {'Content-Type': 'application/json'} if payload is not None else {}
+        with self._lock:
+            for attempt in range(2):
+                if self._conn is None:
+                    self._conn = _UnixHTTPConnection(self.socket_path, self.timeout)
+                try:
+                    self._conn.request(method, path, body=payload, headers=headers)
+                    response = self._conn.getresponse()
+                    data = response.read()
+                    break
+                except (http.client.HTTPException, OSError) as e:
+                    self._conn.close()
+                    self._conn = None
+                    # Retry once only if the daemon closed an idle keep-alive connection,
+                    # and only for reads: a POST/DELETE may already have taken effect.
+                    retryable = method in ('GET', 'HEAD') and isinstance(
+                        e, (http.client.HTTPException, ConnectionError)
+                    )
+                    if attempt or not retryable:
+                        raise OSError(f"Docker API request failed: {method} {path}") from e
+        if decode and response.getheader('Content-Type', '').startswith('application/json'):
+            return response.status, json.loads(data) if data else None
+        return response.status, data
+
+    def get(self, path):
+        return self.request('GET', path)
+
+    def post(self, path, body=None):
+        return self.request('POST', path, body)
+
+    def delete(self, path):
+        return self.request('DELETE', path)
+
+
+_docker_api = None
+
+
+def _get_docker_api():
+    """
+    Return the shared Engine API client, or None when no local UNIX socket is usable
+
+    Honours DOCKER_HOST when it points at a unix:// socket; any other scheme
+    (tcp://, ssh://, npipe://) is left to the docker CLI.
+    """
+    global _docker_api
+    if _docker_api is None:
+        docker_host = os.environ.get('DOCKER_HOST', 'unix:///var/run/docker.sock')
+        if not docker_host.startswith('unix://'):
+            return None
+        socket_path = docker_host[len('unix://'):]
+        if not os.path.exists(socket_path):
+            return None
+        _docker_api = _DockerSocket(socket_path)
+    return _docker_api
+
+
+_MEMORY_UNITS = {'': 1, 'k': 1024, 'm': 1024 ** 2, 'g': 1024 ** 3, 't': 1024 ** 4}
+
+
+def _parse_memory_limit(value):
+    """
+    Convert a docker --memory value (e.g. '512m', '2g', '1.5gb') to bytes
+
+    :raises ValueError: If the value is not a valid size
+    """
+    value = value.strip().lower().removesuffix('b')
+    unit = value[-1:] if value[-1:].isalpha() else ''
+    if unit not in _MEMORY_UNITS:
+        raise ValueError(f"Invalid memory limit: {value}")
+    return int(float(value[:len(value) - len(unit)]) * _MEMORY_UNITS[unit])
+
+
+def _run_with_pidfd(cmd, timeout):
+    """
+    Run a command, waking on process exit via a pidfd instead of a poll loop
+
+    stdout and stderr are drained on the same poll set as the pidfd, so a child
+    writing more than a pipe buffer never blocks waiting for a reader. Falls
+    back to subprocess.run where pidfd_open is unavailable (non-Linux or
+    kernels before 5.3).
+
+    :param cmd: Command argument list
+    :param timeout: Maximum run time in seconds
+    :return: subprocess.CompletedProcess with text stdout/stderr
+    :raises subprocess.TimeoutExpired: If the command did not exit in time
+    """
+    if not hasattr(os, 'pidfd_open'):
+        return subprocess.run(cmd, capture_output=True, text=True, timeout=timeout)
+    proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+    try:
+        pidfd = os.pidfd_open(proc.pid)
+    except OSError:
+        stdout, stderr = proc.communicate(timeout=timeout)
+        return subprocess.CompletedProcess(cmd, proc.returncode, stdout, stderr)
+
+    deadline = time.monotonic() + timeout
+    out_fd, err_fd = proc.stdout.fileno(), proc.stderr.fileno()
+    output = {out_fd: [], err_fd: []}
+    open_fds = set(output)
+    exited = False
+    try:
+        poller = select.poll()
+        poller.register(pidfd, select.POLLIN)
+        for fd in open_fds:
+            poller.register(fd, select.POLLIN)
+        while open_fds or not exited:
+            remaining = deadline - time.monotonic()
+            events = poller.poll(remaining * 1000) if remaining > 0 else []
+            if not events:
+                proc.kill()
+                proc.communicate()
+                raise subprocess.TimeoutExpired(cmd, timeout)
+            for fd, _ in events:
+                if fd == pidfd:
+                    exited = True
+                    poller.unregister(pidfd)
+                    continue
+                data = os.read(fd, 65536)
+                if data:
+                    output[fd].append(data)
+                else:
+                    poller.unregister(fd)
+                    open_fds.discard(fd)
+    finally:
+        os.close(pidfd)
+    proc.stdout.close()
+    proc.stderr.close()
+    proc.wait()
+    stdout, stderr = (b''.join(output[fd]).decode(errors='replace') for fd in (out_fd, err_fd))
+    return subprocess.CompletedProcess(cmd, proc.returncode, stdout, stderr)
+
+
+def _wait_for_port(host, port, timeout):
+    """
+    Block until host:port accepts a TCP connection or the timeout elapses
+
+    Each attempt is a non-blocking connect whose completion is awaited on a
+    selector, so the wait ends as soon as the listener is up instead of on a
+    fixed poll tick. Every resolved address is tried on each pass (e.g. both
+    ::1 and 127.0.0.1 for localhost, where a container may publish only on
+    IPv4). Refused connects are retried with backoff capped at 500ms.
+
+    :param host: Hostname or IP address
+    :param port: TCP port
+    :param timeout: Maximum wait time in seconds
+    :return: True if the port accepted a connection, False on timeout
+    """
+    deadline = time.monotonic() + timeout
+    delay = 0.05
+    try:
+        addrinfos = socket.getaddrinfo(host, port, type=socket.SOCK_STREAM)
+    except OSError:
+        return False
+
+    with selectors.DefaultSelector() as sel:
+        while True:
+            for family, socktype, proto, _, addr in addrinfos:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                try:
+                    sock = socket.socket(family, socktype, proto)
+                except OSError:
+                    continue  # e.g. IPv6 disabled on this host
+                with sock:
+                    sock.setblocking(False)
+                    err = sock.connect_ex(addr)
+                    if err in (errno.EINPROGRESS, errno.EWOULDBLOCK):
+                        sel.register(sock, selectors.EVENT_WRITE)
+                        ready = sel.select(remaining)
+                        sel.unregister(sock)
+                        err = sock.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR) if ready else errno.ETIMEDOUT
+                if err == 0:
+                    return True
+            if deadline - time.monotonic() <= 0:
+                return False
+            time.sleep(max(0, min(delay, deadline - time.monotonic())))
+            delay = min(delay * 2, 0.5)
+
 
 class ZapInstanceProvider(ABC):
     """Abstract base class for ZAP instance providers"""
 
+    # Clients (and their pooled requests.Session) are shared per (url, key,
+    # timeout) so repeated provisions in one process keep their keep-alive
+    # connections. Shared clients are never reconfigured or closed by a provider.
+    _client_by_url: dict[tuple[str, str | None, int], ZAPAPIClient] = {}
+    _client_lock = threading.Lock()
+
     def __init__(self, config, debug_callback=None):
         """
         Initialize provider
@@ -23,9 +331,30 @@ class ZapInstanceProvider(ABC):
         """
         self.config = config
         self.debug = debug_callback or (lambda x: None)
+        self._debug_enabled = debug_callback is not None
         self.zap_client = None
         self.instance_info = {}
 
+    def _get_client(self, api_url, api_key, timeout=30):
+        """
+        Return the shared ZAPAPIClient for this URL/key/timeout, creating it on first use
+
+        :param api_url: Base URL for ZAP API
+        :param api_key: Optional API key
+        :param timeout: Request timeout in seconds
+        :return: ZAPAPIClient
+        """
+        key = (api_url, api_key, timeout)
+        with ZapInstanceProvider._client_lock:
+            client = ZapInstanceProvider._client_by_url.get(key)
+            if client is None:
+                debug_callback = self.debug if self._debug_enabled else None
+                client = ZAPAPIClient(api_url, api_key, timeout=timeout, debug_callback=debug_callback)
+                ZapInstanceProvider._client_by_url[key] = client
+                return client
+        self.debug(f"Reusing ZAP API client for {api_url}")
+        return client
+
     @abstractmethod
     def provision(self, target_url, output_dir):
         """
@@ -76,54 +405,207 @@ class ZapInstanceProvider(ABC):
         pass
 
 
+@dataclass(frozen=True, slots=True)
+class _LocalCfg:
+    """Resolved ``local`` section of the ZAP config, read once per provider."""
+
+    docker_image: str = 'ghcr.io/zaproxy/zaproxy:stable'
+    api_port: int = 8080
+    api_key: str = 'kast-local'
+    container_name: str = 'kast-zap-local'
+    memory_limit: str = ''
+    auto_start: bool = True
+    cleanup_on_completion: bool = False
+
+    @classmethod
+    def from_config(cls, config):
+        local_config = config.get('local', {})
+        return cls(**{f.name: local_config[f.name] for f in fields(cls) if f.name in local_config})
+
+
 class LocalZapProvider(ZapInstanceProvider):
     """Provider for local ZAP instances (Docker or native)"""
 
     def __init__(self, config, debug_callback=None):
         super().__init__(config, debug_callback)
+        self.local_cfg = _LocalCfg.from_config(config)
         self.container_name = None
         self.started_container = False
         self.temp_config_dir = None
+        self._reports_dir = None
+        self._written_plan_digest = None
         self.plan_id = None
 
     def get_mode_name(self):
         return "local"
 
     def _check_docker_available(self):
-        """Check if Docker is available"""
+        """Check if Docker is available (a positive result is memoized for the process lifetime)"""
+        global _docker_available
+        if _docker_available:
+            return True
+        available = False
+        api = _get_docker_api()
+        if api is not None:
+            try:
+                status, _ = api.get('/_ping')
+                available = status == 200
+            except OSError as e:
+                self.debug(f"Docker socket unavailable, falling back to CLI: {e}")
+        if not available:
+            try:
+                available = _run_with_pidfd(['docker', '--version'], timeout=5).returncode == 0
+            except (subprocess.TimeoutExpired, FileNotFoundError, OSError):
+                available = False
+        if available:
+            with _docker_cache_lock:
+                _docker_available = True
+        return available
+
+    def _find_running_zap_container(self):
+        """Find running ZAP container (cached for _CONTAINER_CACHE_TTL seconds)"""
+        global _running_container
+        with _docker_cache_lock:
+            cached = _running_container
+        if cached and time.monotonic() - cached[0] < _CONTAINER_CACHE_TTL:
+            container_name = cached[1]
+        else:
+            container_name = self._inspect_known_container() or self._query_running_zap_container()
+            with _docker_cache_lock:
+                _running_container = (time.monotonic(), container_name)
+        if container_name:
+            self.debug(f"Found running ZAP container: {container_name}")
+            return container_name
+        return None
+
+    def _query_running_zap_container(self):
+        """
+        Return the first running ZAP container name, or ''
+
+        Containers started by kast are found by label, which the daemon answers
+        from its index. Only when none is running are third-party ZAP
+        containers matched by image, which resolves every container's image.
+        """
+        for key, value in _ZAP_CONTAINER_FILTERS:
+            container = self._query_containers(key, value)
+            if container:
+                _remember_container(container)
+                return container[1]
+        return ''
+
+    def _query_containers(self, key, value):
+        """Return (id, name) of the first running container matching a docker ps filter, or None"""
+        api = _get_docker_api()
+        if api is not None:
+            filters = quote(json.dumps({key: [value]}))
+            try:
+                status, containers = api.get(f'/containers/json?filters={filters}')
+                if status == 200:
+                    for container in containers:
+                        if container.get('Names'):
+                            return container['Id'], container['Names'][0].lstrip('/')
+                    return None
+            except (OSError, ValueError, KeyError, TypeError) as e:
+                self.debug(f"Docker socket query failed, falling back to CLI: {e!r}")
+        cmd = ['docker', 'ps', '--filter', f'{key}={value}', '--format', '{{.ID}} {{.Names}}']
         try:
-            result = subprocess.run(['docker', '--version'],
-                                   capture_output=True,
-                                   text=True,
-                                   timeout=5)
-            return result.returncode == 0
-        except (subprocess.TimeoutExpired, FileNotFoundError, OSError):
+            with subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+                                  text=True) as proc:
+                # Only the first container is needed; stop docker as soon as it arrives.
+                ready, _, _ = select.select([proc.stdout], [], [], 5)
+                line = proc.stdout.readline().split() if ready else []
+                proc.kill()
+        except OSError:
+            return None
+        return (line[0], line[1]) if len(line) == 2 else None
+
+    def _inspect_known_container(self):
+        """
+        Return the remembered container's name if it is still running, else ''
+
+        Inspecting one container by id is a direct lookup, unlike the filtered
+        list, which walks every container on the host.
+        """
+        global _known_container
+        with _docker_cache_lock:
+            known = _known_container
+        if known is None:
+            return ''
+        container_id, container_name = known
+        running = None
+        api = _get_docker_api()
+        if api is not None:
+            try:
+                status, info = api.get(f'/containers/{quote(container_id)}/json')
+                running = status == 200 and info['State']['Running'] is True
+            except (OSError, ValueError, KeyError, TypeError) as e:
+                # Unreachable socket or an unexpected body (e.g. error JSON without State)
+                self.debug(f"Docker socket query failed, falling back to CLI: {e!r}")
+        if running is None:
+            try:
+                result = _run_with_pidfd(
+                    ['docker', 'inspect', '-f', '{{.State.Running}}', container_id], timeout=10
+                )
+                running = result.stdout.strip() == 'true'
+            except (subprocess.TimeoutExpired, OSError):
+                running = False
+        if not running:
+            with _docker_cache_lock:
+                # Another thread may have recorded a newer container meanwhile.
+                if _known_container == known:
+                    _known_container = None
+            return ''
+        return container_name
+
+    def _image_present(self):
+        """Check whether the configured ZAP image is available locally"""
+        image = self.local_cfg.docker_image
+        api = _get_docker_api()
+        if api is not None:
+            try:
+                status, _ = api.get(f'/images/{quote(image)}/json')
+                return status == 200
+            except OSError as e:
+                self.debug(f"Docker socket query failed, falling back to CLI: {e}")
+        try:
+            return _run_with_pidfd(['docker', 'image', 'inspect', image], timeout=30).returncode == 0
+        except (subprocess.TimeoutExpired, OSError):
             return False
 
-    def _find_running_zap_container(self):
-        """Find running ZAP container"""
+    def _pull_image(self):
+        """Pull the configured ZAP image; return True on success"""
+        image = self.local_cfg.docker_image
+        self.debug(f"Pulling ZAP image: {image}")
+        api = _get_docker_api()
+        if api is not None:
+            try:
+                status, body = api.request(
+                    'POST', f"/images/create?fromImage={quote(image, safe='')}", decode=False
+                )
+                # The daemon reports pull failures inside the 200 progress stream.
+                failed = status != 200 or any(
+                    'error' in json.loads(line) for line in body.splitlines() if line.strip()
+                )
+                if not failed:
+                    return True
+                # The API call carries no X-Registry-Auth, so private registries
+                # fail here; the CLI pull uses the user's docker credentials.
+                self.debug(f"Docker API pull of {image} failed, falling back to CLI: {body[-500:]!r}")
+            except (OSError, ValueError) as e:
+                self.debug(f"Docker API pull failed, falling back to CLI: {e}")
         try:
-            result = subprocess.run(['docker', 'ps', '--filter', 'ancestor=ghcr.io/zaproxy/zaproxy',
-                                    '--format', '{{.Names}}'],
-                                   capture_output=True,
-                                   text=True,
-                                   timeout=5)
-            if result.returncode == 0 and result.stdout.strip():
-                container_name = result.stdout.strip().split('\n')[0]
-                self.debug(f"Found running ZAP container: {container_name}")
-                return container_name
-        except (subprocess.TimeoutExpired, FileNotFoundError, OSError):
-            pass
-        return None
+            result = _run_with_pidfd(['docker', 'pull', image], timeout=600)
+            if result.returncode != 0:
+                self.debug(f"Failed to pull {image}: {result.stderr}")
+            return result.returncode == 0
+        except (subprocess.TimeoutExpired, OSError) as e:
+            self.debug(f"Error pulling image: {e}")
+            return False
 
     def _start_zap_container(self, output_dir):
         """Start new ZAP Docker container"""
-        local_config = self.config.get('local', {})
-        docker_image = local_config.get('docker_image', 'ghcr.io/zaproxy/zaproxy:stable')
-        api_port = local_config.get('api_port', 8080)
-        api_key = local_config.get('api_key', 'kast-local')
-        self.container_name = local_config.get('container_name', 'kast-zap-local')
-        memory_limit = local_config.get('memory_limit', '')
+        cfg = self.local_cfg
+        self.container_name = cfg.container_name
 
         # Create temporary directories for ZAP
         self.temp_config_dir = Path(output_dir) / 'zap_config'
@@ -131,40 +613,104 @@ class LocalZapProvider(ZapInstanceProvider):
 
         reports_dir = Path(output_dir) / 'zap_reports'
         reports_dir.mkdir(exist_ok=True)
+        self._reports_dir = str(reports_dir)
 
         self.debug(f"Starting local ZAP container: {self.container_name}")
 
-        # Start container
+        # Fixed ZAP options go in one properties file on the config mount rather
+        # than a -config pair per option. The API key stays on the command line:
+        # the mount lives under output_dir, which kast-web publishes.
+        (self.temp_config_dir / 'kast.properties').write_text(
+            'api.addrs.addr.name=.*\n'
+            'api.addrs.addr.regex=true\n'
+            'api.filexfer=true\n'
+            'network.localServers.mainProxy.address=0.0.0.0\n'
+            'autoupdate.checkOnStart=false\n'
+        )
+        zap_args = [
+            'zap.sh', '-daemon', '-port', '8080',
+            '-configfile', '/zap/config/kast.properties',
+            '-config', f'api.key={cfg.api_key}',
+        ]
+        if cfg.memory_limit:
+            self.debug(f"ZAP container memory limit: {cfg.memory_limit}")
+
+        started = self._start_container_via_api(zap_args)
+        if started is None:
+            started = self._start_container_via_cli(zap_args)
+        if started:
+            self.debug("ZAP container started successfully")
+            self.started_container = True
+            invalidate_docker_cache()
+        return started
+
+    def _start_container_via_api(self, zap_args):
+        """
+        Create and start the container through the Engine API
+
+        :return: True/False on success/failure, None if the CLI should be used
+                 instead (no socket, or the image still needs pulling)
+        """
+        api = _get_docker_api()
+        if api is None:
+            return None
+        cfg = self.local_cfg
+        host_config = {
+            'PortBindings': {'8080/tcp': [{'HostPort': str(cfg.api_port)}]},
+            'Binds': [f'{self.temp_config_dir}:/zap/config', f'{self._reports_dir}:/zap/reports'],
+        }
+        try:
+            if cfg.memory_limit:
+                host_config['Memory'] = _parse_memory_limit(cfg.memory_limit)
+            status, created = api.post(
+                f'/containers/create?name={quote(self.container_name)}',
+                {
+                    'Image': cfg.docker_image,
+                    'Cmd': zap_args,
+                    'Labels': {_ZAP_CONTAINER_LABEL: '1', 'kast-owner': str(os.getpid())},
+                    'ExposedPorts': {'8080/tcp': {}},
+                    'HostConfig': host_config,
+                },
+            )
+            if status == 404:
+                # Image not present locally; docker run pulls it.
+                return None
+            if status != 201:
+                self.debug(f"Failed to create container: {created}")
+                return False
+            status, body = api.post(f"/containers/{created['Id']}/start")
+            if status not in (204, 304):
+                self.debug(f"Failed to start container: {body}")
+                return False
+            _remember_container((created['Id'], self.container_name))
+            return True
+        except (OSError, ValueError) as e:
+            self.debug(f"Docker API start failed, falling back to CLI: {e}")
+            return None
+
+    def _start_container_via_cli(self, zap_args):
+        """Start the container with docker run"""
+        cfg = self.local_cfg
         cmd = [
             'docker', 'run', '-d',
             '--name', self.container_name,
-            '-p', f'{api_port}:8080',
+            '--label', f'{_ZAP_CONTAINER_LABEL}=1',
+            '--label', f'kast-owner={os.getpid()}',
+            '-p', f'{cfg.api_port}:8080',
             '-v', f'{self.temp_config_dir}:/zap/config',
-            '-v', f'{reports_dir}:/zap/reports',
-        ]
-        if memory_limit:
-            cmd += ['--memory', memory_limit]
-            self.debug(f"ZAP container memory limit: {memory_limit}")
-        cmd += [
-            docker_image,
-            'zap.sh', '-daemon', '-port', '8080',
-            '-config', f'api.key={api_key}',
-            '-config', 'api.addrs.addr.name=.*',
-            '-config', 'api.addrs.addr.regex=true',
-            '-config', 'api.filexfer=true',
-            '-config', 'network.localServers.mainProxy.address=0.0.0.0',
-            '-config', 'autoupdate.checkOnStart=false'
+            '-v', f'{self._reports_dir}:/zap/reports',
         ]
+        if cfg.memory_limit:
+            cmd += ['--memory', cfg.memory_limit]
+        cmd += [cfg.docker_image, *zap_args]
 
         try:
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
+            result = _run_with_pidfd(cmd, timeout=30)
             if result.returncode == 0:
-                self.debug("ZAP container started successfully")
-                self.started_container = True
+                _remember_container((result.stdout.strip(), self.container_name))
                 return True
-            else:
-                self.debug(f"Failed to start container: {result.stderr}")
-                return False
+            self.debug(f"Failed to start container: {result.stderr}")
+            return False
         except Exception as e:
             self.debug(f"Error starting container: {e}")
             return False
@@ -173,32 +719,47 @@ class LocalZapProvider(ZapInstanceProvider):
         """Provision local ZAP instance"""
         self.debug("Provisioning local ZAP instance...")
 
-        if not self._check_docker_available():
-            return False, None, {"error": "Docker not available"}
+        cfg = self.local_cfg
 
-        local_config = self.config.get('local', {})
-        api_port = local_config.get('api_port', 8080)
-        api_key = local_config.get('api_key', 'kast-local')
-        auto_start = local_config.get('auto_start', True)
+        # The probes are independent docker round trips; run them together.
+        with ThreadPoolExecutor(max_workers=3) as pool:
+            docker_probe = pool.submit(self._check_docker_available)
+            container_probe = pool.submit(self._find_running_zap_container)
+            image_probe = pool.submit(self._image_present) if cfg.auto_start else None
+            docker_available = docker_probe.result()
+            existing_container = container_probe.result()
+            image_present = image_probe.result() if image_probe else False
 
-        # Check for existing container
-        existing_container = self._find_running_zap_container()
+        if not docker_available:
+            return False, None, {"error": "Docker not available"}
 
         if existing_container:
             self.debug(f"Using existing ZAP container: {existing_container}")
             self.container_name = existing_container
-        elif auto_start:
+        elif cfg.auto_start:
+            if not image_present and not self._pull_image():
+                return False, None, {"error": f"Failed to pull {cfg.docker_image}"}
             if not self._start_zap_container(output_dir):
                 return False, None, {"error": "Failed to start ZAP container"}
         else:
             return False, None, {"error": "No running ZAP container found and auto_start disabled"}
 
         # Create ZAP API client
-        api_url = f"http://localhost:{api_port}"
-        self.zap_client = ZAPAPIClient(api_url, api_key, debug_callback=self.debug)
-
-        # Wait for ZAP to be ready
-        if not self.zap_client.wait_for_ready(timeout=120, poll_interval=5):
+        api_url = f"http://localhost:{cfg.api_port}"
+        self.zap_client = self._get_client(api_url, cfg.api_key)
+
+        # An already-running container is almost always ready: probe once before
+        # falling back to waiting for the port and then for the API to answer.
+        ready_deadline = time.monotonic() + 120
+        ready = (
+            existing_container and self.zap_client.probe_ready_once()
+        ) or (
+            _wait_for_port('localhost', cfg.api_port, 120)
+            and self.zap_client.wait_for_ready(
+                timeout=max(1, ready_deadline - time.monotonic()), poll_interval=5
+            )
+        )
+        if not ready:
             if self.started_container:
                 self._cleanup_container()
             return False, None, {"error": "ZAP not ready"}
@@ -224,31 +785,15 @@ class LocalZapProvider(ZapInstanceProvider):
             self.debug("No ZAP client available")
             return False
 
-        plan_content = plan_content.replace('${TARGET_URL}', target_url)
+        plan_bytes = render_automation_plan(plan_content, target_url).encode('utf-8')
 
         # Also write to the mounted config dir for debugging reference.
         if self.temp_config_dir:
-            try:
-                plan_path = self.temp_config_dir / 'automation_plan.yaml'
-                with open(plan_path, 'w') as f:
-                    f.write(plan_content)
-                self.debug(f"Automation plan written to {plan_path}")
-            except Exception as e:
-                self.debug(f"Warning: could not write plan to config dir: {e}")
+            self._write_plan_copy(plan_bytes)
 
         try:
-            from io import BytesIO
-            target_filename = 'kast_automation_plan.yaml'
-
             self.debug("Step 1: Uploading automation plan file to local ZAP...")
-            upload_response = self.zap_client._make_request(
-                '/OTHER/core/other/fileUpload/',
-                method='POST',
-                files={'fileContents': ('automation_plan.yaml',
-                                        BytesIO(plan_content.encode('utf-8')),
-                                        'application/octet-stream')},
-                data={'fileName': target_filename},
-            )
+            upload_response = self.zap_client.upload_file(plan_bytes, 'kast_automation_plan.yaml')
 
             if not upload_response:
                 self.debug("Failed to upload automation plan file")
@@ -260,11 +805,7 @@ class LocalZapProvider(ZapInstanceProvider):
                 return False
 
             self.debug(f"Step 2: Running automation plan at: {uploaded_path}")
-            run_response = self.zap_client._make_request(
-                '/JSON/automation/action/runPlan/',
-                method='POST',
-                data={'filePath': uploaded_path},
-            )
+            run_response = self.zap_client.run_automation_plan(uploaded_path)
 
             if run_response and 'planId' in run_response:
                 self.plan_id = run_response['planId']
@@ -283,6 +824,20 @@ class LocalZapProvider(ZapInstanceProvider):
             self.debug(f"Error uploading automation plan: {e}")
             return False
 
+    def _write_plan_copy(self, plan_bytes):
+        """Write the rendered plan into the mounted config dir, skipping identical rewrites."""
+        digest = hashlib.blake2b(plan_bytes, digest_size=16).digest()
+        plan_path = self.temp_config_dir / 'automation_plan.yaml'
+        if digest == self._written_plan_digest and plan_path.exists():
+            self.debug(f"Automation plan unchanged at {plan_path}")
+            return
+        try:
+            plan_path.write_bytes(plan_bytes)
+            self._written_plan_digest = digest
+            self.debug(f"Automation plan written to {plan_path}")
+        except Exception as e:
+            self.debug(f"Warning: could not write plan to config dir: {e}")
+
     def wait_for_plan_completion(self, timeout, poll_interval, output_dir=None):
         """Wait for automation plan to complete."""
         if not self.plan_id:
@@ -299,41 +854,52 @@ class LocalZapProvider(ZapInstanceProvider):
         """Download results from local container"""
         try:
             # Results are already in mounted volume
-            reports_dir = Path(output_dir) / 'zap_reports'
-            report_path = reports_dir / report_name
+            reports_dir = self._reports_dir or os.path.join(output_dir, 'zap_reports')
+            report_path = os.path.join(reports_dir, report_name)
 
-            if report_path.exists():
+            if os.path.exists(report_path):
                 self.debug(f"Report found at {report_path}")
-                return str(report_path)
+                return report_path
 
             # If not found, generate via API
             self.debug("Generating report via API...")
-            output_path = Path(output_dir) / report_name
-            self.zap_client.generate_report(str(output_path), 'json')
-            return str(output_path)
+            output_path = os.path.join(output_dir, report_name)
+            self.zap_client.generate_report(output_path, 'json')
+            return output_path
 
         except Exception as e:
             self.debug(f"Error downloading results: {e}")
             return None
 
     def _cleanup_container(self):
-        """Stop and remove container"""
+        """Kill and remove container"""
         if self.container_name and self.started_container:
             try:
-                self.debug(f"Stopping container: {self.container_name}")
-                subprocess.run(['docker', 'stop', self.container_name],
-                             capture_output=True, timeout=30)
-                subprocess.run(['docker', 'rm', self.container_name],
-                             capture_output=True, timeout=30)
+                # ZAP holds no state worth a graceful shutdown; force-remove kills
+                # and removes in one call instead of waiting out docker stop.
+                self.debug(f"Removing container: {self.container_name}")
+                api = _get_docker_api()
+                try:
+                    if api is None:
+                        raise OSError("Docker socket not available")
+                    status, body = api.delete(f'/containers/{quote(self.container_name)}?force=1')
+                    # 204 removed, 404 already gone; anything else left it behind
+                    if status not in (204, 404):
+                        raise OSError(f"Docker API returned {status} removing container: {body}")
+                except OSError as e:
+                    self.debug(f"{e}; falling back to docker rm -f")
+                    result = _run_with_pidfd(['docker', 'rm', '-f', self.container_name], timeout=30)
+                    if result.returncode != 0:
+                        self.debug(f"docker rm -f failed: {result.stderr.strip()}")
             except Exception as e:
                 self.debug(f"Error stopping container: {e}")
+            finally:
+                _remember_container(None)
+                invalidate_docker_cache()
 
     def cleanup(self):
         """Cleanup local resources"""
-        local_config = self.config.get('local', {})
-        cleanup_container = local_config.get('cleanup_on_completion', False)
-
-        if cleanup_container:
+        if self.local_cfg.cleanup_on_completion:
             self._cleanup_container()
         else:
             self.debug("Keeping local ZAP container running (cleanup_on_completion=false)")
@@ -345,44 +911,50 @@ class RemoteZapProvider(ZapInstanceProvider):
     def __init__(self, config, debug_callback=None):
         super().__init__(config, debug_callback)
         self.plan_id = None  # Store planId for monitoring
+        self._endpoint = None
 
     def get_mode_name(self):
         return "remote"
 
+    def _resolve_endpoint(self):
+        """
+        Resolve the remote API URL and key from config and environment (once per instance)
+
+        :return: Tuple of (api_url or None, api_key, timeout)
+        """
+        if self._endpoint is None:
+            remote_config = self.config.get('remote', {})
+            api_url = remote_config.get('api_url') or os.environ.get('KAST_ZAP_URL')
+            api_key = remote_config.get('api_key')
+            if api_url:
+                api_url = os.path.expandvars(api_url)
+            if api_key:
+                api_key = os.path.expandvars(api_key)
+            else:
+                api_key = os.environ.get('KAST_ZAP_API_KEY')
+            self._endpoint = (api_url, api_key, remote_config.get('timeout_seconds', 30))
+        return self._endpoint
+
     def provision(self, target_url, output_dir):
         """Connect to remote ZAP instance"""
         self.debug("Connecting to remote ZAP instance...")
 
-        remote_config = self.config.get('remote', {})
-        api_url = remote_config.get('api_url')
-        api_key = remote_config.get('api_key')
-        timeout = remote_config.get('timeout_seconds', 30)
+        api_url, api_key, timeout = self._resolve_endpoint()
 
         # Check for required configuration
         if not api_url:
-            # Check environment variable as fallback
-            api_url = os.environ.get('KAST_ZAP_URL')
-            if not api_url:
-                error_msg = "Remote mode selected but no api_url configured\n"
-                error_msg += "Solutions:\n"
-                error_msg += "  1. Set environment variable: export KAST_ZAP_URL='http://your-zap:8080'\n"
-                error_msg += "  2. Use CLI override: --set zap.remote.api_url=http://your-zap:8080\n"
-                error_msg += "  3. Edit config file: remote.api_url in zap_config.yaml"
-                self.debug(f"ERROR: {error_msg}")
-                return False, None, {"error": error_msg}
-
-        # Expand environment variables
-        api_url = os.path.expandvars(api_url)
-        if api_key:
-            api_key = os.path.expandvars(api_key)
-        elif not api_key:
-            # Check environment variable for API key
-            api_key = os.environ.get('KAST_ZAP_API_KEY')
+            error_msg = "Remote mode selected but no api_url configured\n"
+            error_msg += "Solutions:\n"
+            error_msg += "  1. Set environment variable: export KAST_ZAP_URL='http://your-zap:8080'\n"
+            error_msg += "  2. Use CLI override: --set zap.remote.api_url=http://your-zap:8080\n"
+            error_msg += "  3. Edit config file: remote.api_url in zap_config.yaml"
+            self.debug(f"ERROR: {error_msg}")
+            return False, None, {"error": error_msg}
 
         self.debug(f"Connecting to {api_url}")
 
         # Create ZAP API client
-        self.zap_client = ZAPAPIClient(api_url, api_key, timeout=timeout, debug_callback=self.debug)
+        self.zap_client = self._get_client(api_url, api_key, timeout=timeout)
 
         # Test connectivity and get version
         self.debug("Testing ZAP connectivity...")
@@ -422,40 +994,22 @@ class RemoteZapProvider(ZapInstanceProvider):
         """
         try:
             # Substitute target URL in the plan
-            plan_content = plan_content.replace('${TARGET_URL}', target_url)
+            plan_content = render_automation_plan(plan_content, target_url)
 
             self.debug("Uploading automation plan to remote ZAP instance...")
 
             # Step 1: Upload the automation plan file
-            from io import BytesIO
-            plan_file = BytesIO(plan_content.encode('utf-8'))
-
-            # Target filename on ZAP server
-            target_filename = 'kast_automation_plan.yaml'
-
-            # ZAP expects 'fileContents' as the file parameter
-            files = {
-                'fileContents': ('automation_plan.yaml', plan_file, 'application/octet-stream')
-            }
-
-            # Additional data including the target filename
-            data = {
-                'fileName': target_filename
-            }
-
             self.debug("Step 1: Uploading file to ZAP...")
-            upload_response = self.zap_client._make_request(
-                '/OTHER/core/other/fileUpload/',
-                method='POST',
-                files=files,
-                data=data
+            upload_response = self.zap_client.upload_file(
+                plan_content.encode('utf-8'), 'kast_automation_plan.yaml'
             )
 
             if not upload_response:
                 self.debug("Failed to upload automation plan file")
                 return False
 
-            self.debug(f"File upload response: {upload_response}")
+            if self._debug_enabled:
+                self.debug(f"File upload response: {upload_response}")
 
             # Step 2: Run the uploaded automation plan
             # Extract the full uploaded path from response
@@ -465,11 +1019,7 @@ class RemoteZapProvider(ZapInstanceProvider):
                 return False
 
             self.debug(f"Step 2: Running automation plan at: {uploaded_path}")
-            run_response = self.zap_client._make_request(
-                '/JSON/automation/action/runPlan/',
-                method='POST',
-                data={'filePath': uploaded_path}
-            )
+            run_response = self.zap_client.run_automation_plan(uploaded_path)
 
             # Check for planId in response (indicates success)
             if run_response and 'planId' in run_response:
@@ -503,7 +1053,6 @@ class RemoteZapProvider(ZapInstanceProvider):
 
         except Exception as e:
             self.debug(f"Error uploading automation plan: {e}")
-            import traceback
             self.debug(traceback.format_exc())
             return False
 
@@ -531,20 +1080,19 @@ class RemoteZapProvider(ZapInstanceProvider):
         """Download results via JSON report API"""
         try:
             self.debug("Downloading JSON report from ZAP...")
-            report_data = self.zap_client.get_json_report()
-
-            output_path = Path(output_dir) / report_name
-            import json
-            with open(output_path, 'w') as f:
-                json.dump(report_data, f, indent=2)
-
+            output_path = self.zap_client.download_json_report(Path(output_dir) / report_name)
             self.debug(f"✓ Report downloaded to {output_path}")
-            return str(output_path)
+            return output_path
         except Exception as e:
             self.debug(f"Error downloading report: {e}")
             return None
 
     def cleanup(self):
-        """No cleanup needed for remote instances"""
+        """Cleanup remote resources (none; the instance and shared client stay up)"""
         self.debug("Remote mode: No cleanup needed")
 
+
+PROVIDERS_BY_MODE = {
+    'local': LocalZapProvider,
+    'remote': RemoteZapProvider,
+}
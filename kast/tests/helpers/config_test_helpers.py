@@ -3,11 +3,73 @@ Helper functions for configuration testing
 
 This module provides utilities to simplify config testing for KAST plugins.
 """
+import copy
+import functools
 import os
 import tempfile
 
 import yaml
 
+try:
+    from yaml import CSafeDumper as _SafeDumper
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeDumper as _SafeDumper
+
+# JSON Schema type name -> Python type(s) accepted by isinstance()
+_TYPE_MAP = {
+    "string": str,
+    "integer": int,
+    "number": (int, float),
+    "boolean": bool,
+    "array": list,
+    "object": dict,
+    "null": type(None),
+}
+
+# Fields every schema property must define, with the error reported when one
+# is missing (in reporting order)
+_REQUIRED_PROP_MESSAGES = {
+    "default": "Missing 'default' value",
+    "type": "Missing 'type' definition",
+    "description": "Missing 'description'",
+}
+_REQUIRED_PROP_KEYS = frozenset(_REQUIRED_PROP_MESSAGES)
+_NUMERIC_TYPES = frozenset({"integer", "number"})
+
+# Compiled validators keyed by id(schema); the schema itself is kept alongside
+# so a recycled id can never return another schema's validator.
+_compiled_validators = {}
+
+# Memoized helper results keyed by (helper, id(schema), extra args), with the
+# same identity guard as _compiled_validators
+_schema_results = {}
+
+
+def clear_schema_caches():
+    """
+    Drop all memoized schema results and compiled validators.
+
+    Call this after mutating a schema dict in place; otherwise helpers keep
+    returning results computed from its previous contents.
+    """
+    _schema_results.clear()
+    _compiled_validators.clear()
+
+
+def _memoize_per_schema(func):
+    """Cache a helper's result per schema object; callers get a deep copy."""
+    @functools.wraps(func)
+    def wrapper(schema, *args, **kwargs):
+        if not isinstance(schema, dict):
+            return func(schema, *args, **kwargs)
+        key = (func.__name__, id(schema), args, tuple(sorted(kwargs.items())))
+        cached = _schema_results.get(key)
+        if cached is None or cached[0] is not schema:
+            cached = (schema, func(schema, *args, **kwargs))
+            _schema_results[key] = cached
+        return copy.deepcopy(cached[1])
+    return wrapper
+
 
 def create_test_config_file(plugin_configs, global_config=None):
     """
@@ -39,7 +101,7 @@ def create_test_config_file(plugin_configs, global_config=None):
         config_data["global"] = global_config
 
     with open(config_path, 'w') as f:
-        yaml.dump(config_data, f)
+        yaml.dump(config_data, f, Dumper=_SafeDumper, sort_keys=False, default_flow_style=False)
 
     return config_path, temp_dir
 
@@ -72,6 +134,7 @@ def assert_config_values(plugin, expected_values):
         raise AssertionError("Config value mismatches:\n  " + "\n  ".join(errors))
 
 
+@_memoize_per_schema
 def verify_schema_completeness(schema, plugin_name="unknown"):
     """
     Verify a plugin schema has all required fields and follows best practices.
@@ -116,20 +179,17 @@ def verify_schema_completeness(schema, plugin_name="unknown"):
     for key, prop in properties.items():
         prop_path = f"{plugin_name}.{key}"
 
-        # Required fields for each property
-        if "default" not in prop:
-            errors.append(f"{prop_path}: Missing 'default' value")
-
-        if "type" not in prop:
-            errors.append(f"{prop_path}: Missing 'type' definition")
-
-        if "description" not in prop:
-            errors.append(f"{prop_path}: Missing 'description'")
+        # Required fields for each property; one set test covers the common
+        # case where nothing is missing
+        if not _REQUIRED_PROP_KEYS <= prop.keys():
+            for required, message in _REQUIRED_PROP_MESSAGES.items():
+                if required not in prop:
+                    errors.append(f"{prop_path}: {message}")
 
         # Type-specific validation
         prop_type = prop.get("type")
 
-        if prop_type in ["integer", "number"]:
+        if isinstance(prop_type, str) and prop_type in _NUMERIC_TYPES:
             # Numeric types should have constraints
             if "minimum" not in prop and "maximum" not in prop:
                 errors.append(f"{prop_path}: Numeric type should have min/max constraints")
@@ -191,17 +251,7 @@ def verify_type_match(value, json_schema_type):
             return True, None
         return False, f"Expected null, got {type(value).__name__}"
 
-    # Type mapping
-    type_map = {
-        "string": str,
-        "integer": int,
-        "number": (int, float),
-        "boolean": bool,
-        "array": list,
-        "object": dict
-    }
-
-    expected_python_type = type_map.get(json_schema_type)
+    expected_python_type = _TYPE_MAP.get(json_schema_type)
     if expected_python_type is None:
         return False, f"Unknown JSON Schema type: {json_schema_type}"
 
@@ -237,6 +287,7 @@ def extract_cli_command(plugin):
     return None
 
 
+@_memoize_per_schema
 def count_config_properties(schema):
     """
     Count the number of configuration properties in a schema.
@@ -250,10 +301,10 @@ def count_config_properties(schema):
     if not isinstance(schema, dict):
         return 0
 
-    properties = schema.get("properties", {})
-    return len(properties)
+    return len(schema.get("properties") or ())
 
 
+@_memoize_per_schema
 def get_schema_defaults(schema):
     """
     Extract all default values from a schema.
@@ -268,17 +319,11 @@ def get_schema_defaults(schema):
         defaults = get_schema_defaults(plugin.config_schema)
         assert defaults["timeout"] == 300
     """
-    defaults = {}
-
     if not isinstance(schema, dict):
-        return defaults
-
-    properties = schema.get("properties", {})
-    for key, prop in properties.items():
-        if "default" in prop:
-            defaults[key] = prop["default"]
+        return {}
 
-    return defaults
+    properties = schema.get("properties") or {}
+    return {key: prop["default"] for key, prop in properties.items() if "default" in prop}
 
 
 def validate_config_against_schema(config_values, schema):
@@ -299,36 +344,84 @@ def validate_config_against_schema(config_values, schema):
         )
         assert len(errors) > 0
     """
-    errors = []
-
     if not isinstance(schema, dict):
         return ["Schema is not a dictionary"]
 
-    properties = schema.get("properties", {})
+    return compile_validator(schema)(config_values)
 
-    for key, value in config_values.items():
-        if key not in properties:
-            errors.append(f"Unknown config key: {key}")
+
+def _accepted_types(json_schema_type):
+    """Flatten a JSON Schema type (string or list) into an isinstance() tuple."""
+    names = json_schema_type if isinstance(json_schema_type, list) else [json_schema_type]
+    accepted = []
+    for name in names:
+        python_type = _TYPE_MAP.get(name)
+        if python_type is None:
             continue
+        accepted.extend(python_type if isinstance(python_type, tuple) else (python_type,))
+    return tuple(accepted)
+
 
-        prop = properties[key]
+def compile_validator(schema):
+    """
+    Compile a schema into a reusable config validator.
+
+    The per-property type tuples and numeric bounds are resolved once, so
+    validating many configs against the same schema only pays for an
+    isinstance() and the bound comparisons per value. Error messages are
+    identical to the uncompiled checks in verify_type_match().
+
+    Args:
+        schema: Plugin config_schema dict
+
+    Returns:
+        Callable taking a dict of config values and returning a list of
+        validation error messages (empty if valid)
+
+    Example:
+        validate = compile_validator(plugin.config_schema)
+        assert validate({"timeout": 600}) == []
+    """
+    cached = _compiled_validators.get(id(schema))
+    if cached is not None and cached[0] is schema:
+        return cached[1]
+
+    checks = {}
+    for key, prop in schema.get("properties", {}).items():
         prop_type = prop.get("type")
+        if prop_type in ["integer", "number"]:
+            bounds = (prop.get("minimum"), prop.get("maximum"))
+        else:
+            bounds = None
+        checks[key] = (prop_type, _accepted_types(prop_type), bounds)
 
-        # Type validation
-        is_valid, error = verify_type_match(value, prop_type)
-        if not is_valid:
-            errors.append(f"{key}: {error}")
-            continue
+    def validate(config_values):
+        errors = []
+        for key, value in config_values.items():
+            check = checks.get(key)
+            if check is None:
+                errors.append(f"Unknown config key: {key}")
+                continue
 
-        # Numeric constraint validation
-        if prop_type in ["integer", "number"] and value is not None:
-            minimum = prop.get("minimum")
-            maximum = prop.get("maximum")
+            prop_type, accepted, bounds = check
 
-            if minimum is not None and value < minimum:
-                errors.append(f"{key}: Value {value} below minimum {minimum}")
+            # Type validation; only the failure path needs the message
+            if not isinstance(value, accepted):
+                _, error = verify_type_match(value, prop_type)
+                errors.append(f"{key}: {error}")
+                continue
 
-            if maximum is not None and value > maximum:
-                errors.append(f"{key}: Value {value} above maximum {maximum}")
+            # Numeric constraint validation
+            if bounds is not None and value is not None:
+                minimum, maximum = bounds
 
-    return errors
+                if minimum is not None and value < minimum:
+                    errors.append(f"{key}: Value {value} below minimum {minimum}")
+
+                if maximum is not None and value > maximum:
+                    errors.append(f"{key}: Value {value} above maximum {maximum}")
+
+        return errors
+
+    _compiled_validators[id(schema)] = (schema, validate)
+    return validate
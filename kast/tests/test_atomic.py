@@ -1,4 +1,4 @@
-"""Tests for kast.core.atomic.write_json_atomic.
+"""Tests for kast.core.atomic.write_json_atomic and write_bytes_atomic.
 
 These pin down the contract enshrined in docs/web-integration.md
 (state-bearing files must appear atomically).
@@ -10,7 +10,7 @@ from unittest.mock import patch
 
 import pytest
 
-from kast.core.atomic import write_json_atomic
+from kast.core.atomic import write_bytes_atomic, write_json_atomic
 
 
 def test_writes_target_file(tmp_path):
@@ -112,3 +112,25 @@ def test_accepts_pathlike(tmp_path):
     target = tmp_path / "out.json"  # PosixPath
     write_json_atomic(target, {"ok": True})
     assert target.exists()
+
+
+def test_write_bytes_streams_chunks(tmp_path):
+    target = tmp_path / "report.json"
+    write_bytes_atomic(target, iter([b'{"site": ', b'[]}']))
+    assert json.loads(target.read_text()) == {"site": []}
+    assert not Path(f"{target}.tmp").exists()
+
+
+def test_write_bytes_preserves_existing_on_stream_failure(tmp_path):
+    target = tmp_path / "report.json"
+    target.write_text('{"existing": true}')
+
+    def chunks():
+        yield b'{"partial'
+        raise ConnectionError("stream dropped")
+
+    with pytest.raises(ConnectionError):
+        write_bytes_atomic(target, chunks())
+
+    assert json.loads(target.read_text()) == {"existing": True}
+    assert not Path(f"{target}.tmp").exists()
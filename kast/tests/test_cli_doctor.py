@@ -8,8 +8,11 @@ otherwise) and the JSON output shape (consumed by external tooling).
 
 import json
 import os
+import stat
+from pathlib import Path
 from unittest.mock import patch
 
+import pytest
 from click.testing import CliRunner
 
 from kast.cli.doctor import (
@@ -18,6 +21,7 @@ from kast.cli.doctor import (
     OK,
     WARN,
     CheckResult,
+    _apply_safe_fixes,
     check_issue_registry,
     check_plugin_loading,
     check_python_version,
@@ -151,6 +155,47 @@ def test_doctor_fix_forwards_results_dir_to_apply_safe_fixes(tmp_path):
     assert captured["arg"] == custom
 
 
+@pytest.fixture
+def fix_home(tmp_path, monkeypatch):
+    """Point ~ at tmp_path with a user config present and /var/log left alone."""
+    monkeypatch.setenv("HOME", str(tmp_path))
+    config_dir = tmp_path / ".config" / "kast"
+    config_dir.mkdir(parents=True)
+    (config_dir / "config.yaml").write_text("kast: {}\n")
+    real_mkdir = Path.mkdir
+
+    def mkdir(self, *args, **kwargs):
+        if str(self).startswith("/var/log"):
+            raise PermissionError(str(self))
+        return real_mkdir(self, *args, **kwargs)
+
+    monkeypatch.setattr(Path, "mkdir", mkdir)
+    return config_dir
+
+
+def test_fix_scaffolds_ai_config_with_mode_600(fix_home, tmp_path):
+    """The AI key file must be 0600 even under a permissive umask."""
+    old_umask = os.umask(0)
+    try:
+        fixes = _apply_safe_fixes(tmp_path)
+    finally:
+        os.umask(old_umask)
+    ai_config = fix_home / "ai.yaml"
+    assert stat.S_IMODE(ai_config.stat().st_mode) == 0o600
+    assert "provider: anthropic" in ai_config.read_text()
+    assert any(f.name == "AI config template" and f.status == OK for f in fixes)
+
+
+def test_fix_leaves_existing_ai_config_alone(fix_home, tmp_path):
+    ai_config = fix_home / "ai.yaml"
+    ai_config.write_text("api_key: sk-existing\n")
+    ai_config.chmod(0o640)
+    fixes = _apply_safe_fixes(tmp_path)
+    assert ai_config.read_text() == "api_key: sk-existing\n"
+    assert stat.S_IMODE(ai_config.stat().st_mode) == 0o640
+    assert not any(f.name == "AI config template" for f in fixes)
+
+
 # -- driver / Click command --------------------------------------------------
 
 
@@ -0,0 +1,100 @@
+"""
+Tests for the per-schema caches and compiled validators in
+kast.tests.helpers.config_test_helpers.
+"""
+
+import pytest
+
+from kast.tests.helpers.config_test_helpers import (
+    clear_schema_caches,
+    compile_validator,
+    count_config_properties,
+    get_schema_defaults,
+    verify_schema_completeness,
+    verify_type_match,
+)
+
+
+@pytest.fixture
+def schema():
+    clear_schema_caches()
+    yield {
+        "type": "object",
+        "title": "Example",
+        "description": "Example plugin",
+        "properties": {
+            "headers": {"type": "array", "items": {"type": "string"},
+                        "default": ["X-One"], "description": "Headers"},
+            "timeout": {"type": "integer", "minimum": 1, "maximum": 60,
+                        "default": 30, "description": "Timeout"},
+        },
+    }
+    clear_schema_caches()
+
+
+def test_mutable_defaults_do_not_leak_between_calls(schema):
+    defaults = get_schema_defaults(schema)
+    defaults["headers"].append("X-Two")
+    defaults["timeout"] = 5
+    assert get_schema_defaults(schema) == {"headers": ["X-One"], "timeout": 30}
+    assert schema["properties"]["headers"]["default"] == ["X-One"]
+
+
+def test_cached_error_list_is_a_copy(schema):
+    verify_schema_completeness(schema, "example").append("bogus")
+    assert verify_schema_completeness(schema, "example") == []
+
+
+def test_clear_schema_caches_picks_up_mutation(schema):
+    assert count_config_properties(schema) == 2
+    assert verify_schema_completeness(schema, "example") == []
+    del schema["properties"]["timeout"]["description"]
+    schema["properties"]["extra"] = {"type": "string", "default": "", "description": "Extra"}
+
+    # In-place edits are invisible until the caches are cleared
+    assert count_config_properties(schema) == 2
+    assert verify_schema_completeness(schema, "example") == []
+
+    clear_schema_caches()
+    assert count_config_properties(schema) == 3
+    assert verify_schema_completeness(schema, "example") == ["example.timeout: Missing 'description'"]
+
+
+def test_equal_schemas_cached_separately(schema):
+    other = {**schema, "properties": {}}
+    assert count_config_properties(schema) == 2
+    assert count_config_properties(other) == 0
+
+
+@pytest.mark.parametrize("prop_type, value", [
+    ("integer", "abc"),
+    ("boolean", 1),
+    (["integer", "null"], "abc"),
+    (["string", "null"], 3),
+    ("mystery", 3),
+    ("null", 0),
+])
+def test_compiled_type_errors_match_verify_type_match(prop_type, value):
+    validate = compile_validator({"properties": {"field": {"type": prop_type}}})
+    _, expected = verify_type_match(value, prop_type)
+    assert validate({"field": value}) == [f"field: {expected}"]
+
+
+@pytest.mark.parametrize("prop_type", [["integer", "null"], ["string", "null"], "null"])
+def test_compiled_validator_accepts_null_for_nullable_types(prop_type):
+    validate = compile_validator({"properties": {"field": {"type": prop_type}}})
+    assert verify_type_match(None, prop_type) == (True, None)
+    assert validate({"field": None}) == []
+
+
+def test_compiled_validator_bounds_and_unknown_keys(schema):
+    validate = compile_validator(schema)
+    assert validate({"timeout": 30, "headers": []}) == []
+    assert validate({"timeout": 0}) == ["timeout: Value 0 below minimum 1"]
+    assert validate({"timeout": 61}) == ["timeout: Value 61 above maximum 60"]
+    assert validate({"retries": 1}) == ["Unknown config key: retries"]
+
+
+def test_compiled_validator_cached_per_schema(schema):
+    assert compile_validator(schema) is compile_validator(schema)
+    assert compile_validator(schema) is not compile_validator(dict(schema))
@@ -21,6 +21,7 @@ from kast.plugins.cors_analyzer_plugin import (
     _ISSUE_SEVERITY_ORDER,
     CorsAnalyzerPlugin,
 )
+from kast.report_templates import ISSUE_REGISTRY
 
 
 def _no_findings() -> dict:
@@ -315,11 +316,8 @@ class TestRegistryCoverage(unittest.TestCase):
     """Every issue ID the plugin can emit must be in the registry."""
 
     def test_all_issue_ids_present_in_registry(self):
-        registry_path = os.path.join(
-            os.path.dirname(__file__), "..", "data", "issue_registry.json"
-        )
-        with open(registry_path) as f:
-            registry = json.load(f)
+        # Registry parsed once per process by kast.report_templates
+        registry = ISSUE_REGISTRY
 
         # Every key in _ISSUE_SEVERITY is an ID the plugin can emit.
         for issue_id in _ISSUE_SEVERITY:
@@ -7,6 +7,7 @@ All subprocess calls and HTTP calls are mocked — no network, no tools required
 
 import json
 import os
+import shutil
 import tempfile
 import time
 import unittest
@@ -306,6 +307,7 @@ class TestUpstreamFetchers(unittest.TestCase):
 class TestCache(unittest.TestCase):
     def setUp(self):
         self.tmpdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmpdir, ignore_errors=True)
         self._xdg_patch = patch.dict(os.environ, {"XDG_CACHE_HOME": self.tmpdir}, clear=False)
         self._xdg_patch.start()
 
@@ -358,6 +360,7 @@ class TestCache(unittest.TestCase):
 class TestCheckExternalToolUpdates(unittest.TestCase):
     def setUp(self):
         self.tmpdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmpdir, ignore_errors=True)
         self._xdg_patch = patch.dict(os.environ, {"XDG_CACHE_HOME": self.tmpdir}, clear=False)
         self._xdg_patch.start()
 
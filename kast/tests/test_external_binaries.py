@@ -1,6 +1,7 @@
 """Tests for kast.core.external_binaries.find_pd_httpx."""
 
 import os
+import shutil
 import tempfile
 import unittest
 from pathlib import Path
@@ -18,6 +19,7 @@ def _make_executable(path: Path) -> None:
 class TestFindPdHttpx(unittest.TestCase):
     def setUp(self):
         self.tmpdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmpdir, ignore_errors=True)
 
     def test_prefers_well_known_path(self):
         sys_bin = Path(self.tmpdir) / "usr_local_bin"
@@ -5,29 +5,36 @@ Created: 2025-12-05
 """
 
 import json
-import os
 import shutil
 import tempfile
 import unittest
-from unittest.mock import Mock
+from types import SimpleNamespace
+from unittest.mock import patch
 
 from kast.plugins.ftap_plugin import FtapPlugin
 
+# Per-test output dirs live under one base dir that is removed once, after the
+# whole module has run, instead of a full rmtree per test
+_BASE_DIR = None
+
+
+def setUpModule():
+    global _BASE_DIR
+    _BASE_DIR = tempfile.mkdtemp(prefix="kast_ftap_")
+
+
+def tearDownModule():
+    shutil.rmtree(_BASE_DIR, ignore_errors=True)
+
 
 class TestFtapPlugin(unittest.TestCase):
     """Test suite for FtapPlugin."""
 
     def setUp(self):
         """Set up test fixtures."""
-        self.mock_cli_args = Mock()
-        self.mock_cli_args.verbose = False
-        self.plugin = FtapPlugin(self.mock_cli_args)
-        self.test_dir = tempfile.mkdtemp()
-
-    def tearDown(self):
-        """Clean up test fixtures."""
-        if os.path.exists(self.test_dir):
-            shutil.rmtree(self.test_dir)
+        self.cli_args = SimpleNamespace(verbose=False, set=[])
+        self.plugin = FtapPlugin(self.cli_args)
+        self.test_dir = tempfile.mkdtemp(dir=_BASE_DIR)
 
     def test_plugin_initialization(self):
         """Test plugin initializes with correct attributes."""
@@ -126,6 +133,16 @@ class TestFtapPlugin(unittest.TestCase):
         self.assertIn("https://example.com/wp-admin", processed["issues"][0]["description"])
         self.assertNotIn("https://example.com/admin", processed["issues"][0]["description"])
 
+    def test_run_and_dry_run_build_same_command(self):
+        """run() executes exactly the command get_dry_run_info() reports."""
+        self.plugin.concurrency = 50
+        self.plugin.fuzzing = True
+        with patch.object(self.plugin, "is_available", return_value=False):
+            self.plugin.run("https://example.com", self.test_dir, report_only=True)
+        dry_run_info = self.plugin.get_dry_run_info("https://example.com", self.test_dir)
+        self.assertEqual(self.plugin.command_executed, dry_run_info["commands"][0])
+        self.assertIn("--concurrency 50", self.plugin.command_executed)
+
     def test_report_only_mode(self):
         """Test plugin behavior in report-only mode."""
         result = self.plugin.run("https://example.com", self.test_dir, report_only=True)
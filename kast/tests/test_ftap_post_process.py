@@ -8,85 +8,86 @@ import os
 import shutil
 import tempfile
 import unittest
-from unittest.mock import Mock
+from types import SimpleNamespace
 
 from kast.plugins.ftap_plugin import FtapPlugin
+from kast.report_templates import ISSUE_REGISTRY
+
+# Sample ftap data (similar to the provided sample). post_process does not
+# mutate its input, so every test shares this one copy.
+SAMPLE_DATA = {
+    "scan_info": {
+        "url": "https://waas.cudalabx.net/",
+        "mode": "simple",
+        "found_count": 4,
+        "total_count": 4
+    },
+    "results": [
+        {
+            "url": "https://waas.cudalabx.net/#admin/",
+            "status_code": 200,
+            "title": "Hackazon",
+            "confidence": 0.9,
+            "found": True,
+            "has_login_form": True,
+            "technologies": ["Node.js", "jQuery", "PHP", "Bootstrap"]
+        },
+        {
+            "url": "https://waas.cudalabx.net/account/",
+            "status_code": 200,
+            "title": "Hackazon — Login",
+            "confidence": 1.0,
+            "found": True,
+            "has_login_form": True,
+            "technologies": ["Node.js", "jQuery", "Bootstrap"]
+        },
+        {
+            "url": "https://waas.cudalabx.net/admin",
+            "status_code": 200,
+            "title": "Webscantest Admin",
+            "confidence": 1.0,
+            "found": True,
+            "has_login_form": True,
+            "technologies": ["Bootstrap", "HTTP/3"]
+        },
+        {
+            "url": "https://waas.cudalabx.net/admin#/",
+            "status_code": 200,
+            "title": "Webscantest Admin",
+            "confidence": 1.0,
+            "found": True,
+            "has_login_form": True,
+            "technologies": ["Bootstrap", "HTTP/3"]
+        }
+    ]
+}
 
 
 class TestFtapPostProcess(unittest.TestCase):
     """Test suite for ftap plugin post-processing."""
 
-    def setUp(self):
-        """Set up test fixtures."""
-        self.mock_cli_args = Mock()
-        self.mock_cli_args.verbose = False
-        self.plugin = FtapPlugin(self.mock_cli_args)
-        self.test_dir = tempfile.mkdtemp()
+    @classmethod
+    def setUpClass(cls):
+        """Set up shared fixtures and run post_process on SAMPLE_DATA once."""
+        cls.plugin = FtapPlugin(SimpleNamespace(verbose=False, set=[]))
+        cls.sample_data = SAMPLE_DATA
+        cls.test_dir = tempfile.mkdtemp()
 
-        # Sample ftap data (similar to the provided sample)
-        self.sample_data = {
-            "scan_info": {
-                "url": "https://waas.cudalabx.net/",
-                "mode": "simple",
-                "found_count": 4,
-                "total_count": 4
-            },
-            "results": [
-                {
-                    "url": "https://waas.cudalabx.net/#admin/",
-                    "status_code": 200,
-                    "title": "Hackazon",
-                    "confidence": 0.9,
-                    "found": True,
-                    "has_login_form": True,
-                    "technologies": ["Node.js", "jQuery", "PHP", "Bootstrap"]
-                },
-                {
-                    "url": "https://waas.cudalabx.net/account/",
-                    "status_code": 200,
-                    "title": "Hackazon — Login",
-                    "confidence": 1.0,
-                    "found": True,
-                    "has_login_form": True,
-                    "technologies": ["Node.js", "jQuery", "Bootstrap"]
-                },
-                {
-                    "url": "https://waas.cudalabx.net/admin",
-                    "status_code": 200,
-                    "title": "Webscantest Admin",
-                    "confidence": 1.0,
-                    "found": True,
-                    "has_login_form": True,
-                    "technologies": ["Bootstrap", "HTTP/3"]
-                },
-                {
-                    "url": "https://waas.cudalabx.net/admin#/",
-                    "status_code": 200,
-                    "title": "Webscantest Admin",
-                    "confidence": 1.0,
-                    "found": True,
-                    "has_login_form": True,
-                    "technologies": ["Bootstrap", "HTTP/3"]
-                }
-            ]
-        }
+        cls.processed_path = cls.plugin.post_process(SAMPLE_DATA, cls.test_dir)
+        with open(cls.processed_path) as f:
+            cls.processed = json.load(f)
 
-    def tearDown(self):
-        """Clean up test fixtures."""
-        if os.path.exists(self.test_dir):
-            shutil.rmtree(self.test_dir)
+    @classmethod
+    def tearDownClass(cls):
+        """Clean up shared fixtures."""
+        shutil.rmtree(cls.test_dir, ignore_errors=True)
 
     def test_post_process_with_findings(self):
         """Test post-processing with admin panel findings."""
-        # Process the sample data
-        processed_path = self.plugin.post_process(self.sample_data, self.test_dir)
-
         # Verify processed file was created
-        self.assertTrue(os.path.exists(processed_path))
+        self.assertTrue(os.path.exists(self.processed_path))
 
-        # Load and verify processed data
-        with open(processed_path) as f:
-            processed = json.load(f)
+        processed = self.processed
 
         # Check required fields
         self.assertIn("plugin-name", processed)
@@ -123,7 +124,9 @@ class TestFtapPostProcess(unittest.TestCase):
             "results": []
         }
 
-        processed_path = self.plugin.post_process(empty_data, self.test_dir)
+        # Own subdir so the shared processed output is not overwritten
+        output_dir = tempfile.mkdtemp(dir=self.test_dir)
+        processed_path = self.plugin.post_process(empty_data, output_dir)
 
         with open(processed_path) as f:
             processed = json.load(f)
@@ -197,15 +200,8 @@ class TestFtapPostProcess(unittest.TestCase):
 
     def test_issue_registry_entry(self):
         """Test that exposed_admin_panel exists in issue registry."""
-        # Load issue registry
-        registry_path = os.path.join(
-            os.path.dirname(os.path.dirname(__file__)),
-            "data",
-            "issue_registry.json"
-        )
-
-        with open(registry_path) as f:
-            registry = json.load(f)
+        # Registry parsed once per process by kast.report_templates
+        registry = ISSUE_REGISTRY
 
         # Verify exposed_admin_panel entry exists
         self.assertIn("exposed_admin_panel", registry)
@@ -5,6 +5,7 @@ Test Mozilla Observatory post-processing: tests dict is split into
 
 import json
 import os
+import shutil
 import tempfile
 import unittest
 from unittest.mock import Mock
@@ -65,6 +66,7 @@ class TestPostProcessSplit(unittest.TestCase):
         self.config_manager = ConfigManager(self.cli_args)
         self.plugin = ObservatoryPlugin(self.cli_args, self.config_manager)
         self.tmpdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmpdir, ignore_errors=True)
 
     def _load_processed(self):
         path = os.path.join(self.tmpdir, "mozilla_observatory_processed.json")
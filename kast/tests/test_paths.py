@@ -1,6 +1,7 @@
 """Tests for kast.core.paths.resolve_results_dir."""
 
 import os
+import shutil
 import tempfile
 import unittest
 from pathlib import Path
@@ -13,6 +14,7 @@ from kast.core.paths import resolve_results_dir
 class TestResolveResultsDir(unittest.TestCase):
     def setUp(self):
         self.tmpdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmpdir, ignore_errors=True)
 
     def _clear_env(self):
         return patch.dict(os.environ, {}, clear=False) and \
@@ -72,6 +74,7 @@ class TestResolveResultsDir(unittest.TestCase):
 class TestFromConfigFiles(unittest.TestCase):
     def setUp(self):
         self.tmpdir = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.tmpdir, ignore_errors=True)
 
     def _write_config(self, payload: str) -> Path:
         config_path = self.tmpdir / "config.yaml"
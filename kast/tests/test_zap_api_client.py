@@ -0,0 +1,219 @@
+"""
+Tests for ZAPAPIClient connection handling (readiness polling, sessions, reports).
+"""
+
+import itertools
+import socket
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import requests
+
+from kast.scripts.zap_api_client import ZAPAPIClient
+
+
+class TestWaitForReady(unittest.TestCase):
+
+    def setUp(self):
+        self.client = ZAPAPIClient('http://localhost:8080', 'test-key')
+
+    def test_returns_immediately_when_ready(self):
+        with patch.object(self.client, 'check_connection', return_value=True), \
+                patch('time.sleep') as sleep:
+            self.assertTrue(self.client.wait_for_ready(timeout=120, poll_interval=5))
+        sleep.assert_not_called()
+
+    def test_backoff_grows_to_poll_interval_cap(self):
+        attempts = [False] * 8 + [True]
+        with patch.object(self.client, 'check_connection', side_effect=attempts), \
+                patch('time.sleep') as sleep:
+            self.assertTrue(self.client.wait_for_ready(timeout=120, poll_interval=5))
+
+        delays = [c.args[0] for c in sleep.call_args_list]
+        self.assertEqual(len(delays), 8)
+        self.assertAlmostEqual(delays[0], 0.1)
+        self.assertEqual(delays, sorted(delays))
+        self.assertEqual(max(delays), 5)
+
+    def test_timeout(self):
+        with patch.object(self.client, 'check_connection', return_value=False), \
+                patch('time.monotonic', side_effect=itertools.count(0, 25)), \
+                patch('time.sleep'):
+            self.assertFalse(self.client.wait_for_ready(timeout=120, poll_interval=5))
+
+
+class TestWaitForPlanCompletionBackoff(unittest.TestCase):
+
+    def _progress(self, info, finished=''):
+        return {'started': 'now', 'finished': finished, 'info': info, 'warn': [], 'error': []}
+
+    def test_backoff_then_finish(self):
+        client = ZAPAPIClient('http://localhost:8080')
+        responses = [self._progress(['Job spider finished'])] * 6 + [
+            self._progress(['Job spider finished', 'Job report finished'], finished='later')]
+        with patch.object(client, 'get_plan_progress', side_effect=responses), \
+                patch('time.sleep') as sleep:
+            success, _ = client.wait_for_plan_completion(0, timeout=3600, poll_interval=2)
+        self.assertTrue(success)
+        delays = [c.args[0] for c in sleep.call_args_list]
+        self.assertEqual(delays, [0.5, 0.75, 1.125, 1.6875, 2, 2])
+
+    def test_stall_check_waits_for_poll_interval(self):
+        client = ZAPAPIClient('http://localhost:8080')
+        frozen = self._progress(['Job activeScan started'])
+        calls = []
+
+        def make_request(endpoint, **kwargs):
+            calls.append(endpoint)
+            return frozen if 'planProgress' in endpoint else {'status': '100'}
+
+        with patch.object(client, '_make_request', side_effect=make_request), \
+                patch.object(client, '_try_cancel_plan') as cancel, \
+                patch('time.sleep') as sleep:
+            success, _ = client.wait_for_plan_completion(0, timeout=3600, poll_interval=30)
+        self.assertFalse(success)
+        cancel.assert_called_once_with(0)
+        self.assertEqual(calls.count('/JSON/ascan/view/status/'), 2)
+        self.assertGreaterEqual(sum(c.args[0] for c in sleep.call_args_list), 60)
+
+
+class TestProbeReadyOnce(unittest.TestCase):
+
+    def test_uses_short_timeout(self):
+        client = ZAPAPIClient('http://localhost:8080', timeout=30)
+        with patch.object(client.session, 'request', return_value=MagicMock()) as request:
+            self.assertTrue(client.probe_ready_once())
+        self.assertEqual(request.call_args.kwargs['timeout'], 1)
+
+    def test_unreachable(self):
+        client = ZAPAPIClient('http://localhost:8080')
+        with patch.object(client.session, 'request',
+                          side_effect=requests.exceptions.ConnectionError):
+            self.assertFalse(client.probe_ready_once())
+
+
+class TestProbeAgainstHungServer(unittest.TestCase):
+    """A server that accepts connections but never answers."""
+
+    def setUp(self):
+        self.listener = socket.create_server(('127.0.0.1', 0))
+        self.accepted = []
+        self.addCleanup(self.listener.close)
+        threading.Thread(target=self._accept, daemon=True).start()
+
+    def _accept(self):
+        while True:
+            try:
+                conn, _ = self.listener.accept()
+            except OSError:
+                return
+            self.accepted.append(conn)
+            self.addCleanup(conn.close)
+
+    def test_probe_ready_once_attempts_once(self):
+        port = self.listener.getsockname()[1]
+        client = ZAPAPIClient(f'http://127.0.0.1:{port}')
+        started = time.monotonic()
+        self.assertFalse(client.probe_ready_once(timeout=0.3))
+        self.assertLess(time.monotonic() - started, 1.0)
+        self.assertEqual(len(self.accepted), 1)
+
+    def test_check_connection_attempts_once(self):
+        port = self.listener.getsockname()[1]
+        client = ZAPAPIClient(f'http://127.0.0.1:{port}', timeout=0.3)
+        self.assertFalse(client.check_connection())
+        self.assertEqual(len(self.accepted), 1)
+
+
+class TestAutomationPlanRequests(unittest.TestCase):
+
+    def setUp(self):
+        self.client = ZAPAPIClient('http://localhost:8080', 'test-key')
+
+    def test_upload_file(self):
+        with patch.object(self.client, '_make_request', return_value={'Uploaded': '/zap/p.yaml'}) as req:
+            self.assertEqual(self.client.upload_file(b'jobs: []', 'p.yaml'), {'Uploaded': '/zap/p.yaml'})
+        kwargs = req.call_args.kwargs
+        self.assertEqual(req.call_args.args[0], '/OTHER/core/other/fileUpload/')
+        self.assertEqual(kwargs['data'], {'fileName': 'p.yaml'})
+        self.assertEqual(kwargs['files']['fileContents'][1].getvalue(), b'jobs: []')
+
+    def test_run_automation_plan(self):
+        with patch.object(self.client, '_make_request', return_value={'planId': 3}) as req:
+            self.assertEqual(self.client.run_automation_plan('/zap/p.yaml'), {'planId': 3})
+        req.assert_called_once_with('/JSON/automation/action/runPlan/', method='POST',
+                                    data={'filePath': '/zap/p.yaml'})
+
+
+class TestSessionPooling(unittest.TestCase):
+
+    def test_adapter_mounted_without_retries(self):
+        client = ZAPAPIClient('http://localhost:8080')
+        adapter = client.session.get_adapter('http://zap/JSON/core/view/alerts/')
+        self.assertEqual(adapter._pool_maxsize, 16)
+        self.assertEqual(adapter.max_retries.total, 0)
+
+    def test_version_probe_adapter_never_retries(self):
+        client = ZAPAPIClient('http://localhost:8080')
+        adapter = client.session.get_adapter('http://zap/JSON/core/view/version/?apikey=k')
+        self.assertEqual(adapter.max_retries.total, 0)
+
+    def test_close_releases_session(self):
+        client = ZAPAPIClient('http://localhost:8080')
+        with patch.object(client.session, 'close') as close:
+            client.close()
+        close.assert_called_once()
+
+
+class TestDownloadJsonReport(unittest.TestCase):
+
+    def test_streams_body_to_file(self):
+        client = ZAPAPIClient('http://localhost:8080')
+        response = MagicMock()
+        response.__enter__.return_value = response
+        response.iter_content.return_value = iter([b'{"site"', b': []}'])
+        with tempfile.TemporaryDirectory() as tmp, \
+                patch.object(client.session, 'get', return_value=response) as get:
+            path = client.download_json_report(Path(tmp) / 'zap_report.json')
+            self.assertEqual(Path(path).read_text(), '{"site": []}')
+        self.assertTrue(get.call_args.kwargs['stream'])
+        response.json.assert_not_called()
+
+
+class TestDebugElision(unittest.TestCase):
+
+    def _response(self, result=None):
+        response = MagicMock()
+        response.json.return_value = {'version': '2.16.0'} if result is None else result
+        return response
+
+    def test_no_formatting_without_callback(self):
+        result = MagicMock()
+        client = ZAPAPIClient('http://localhost:8080')
+        with patch.object(client.session, 'request', return_value=self._response(result)):
+            client._make_request('/JSON/core/view/version/')
+        result.__str__.assert_not_called()
+
+    def test_assigning_callback_enables_debug(self):
+        client = ZAPAPIClient('http://localhost:8080')
+        client.debug = MagicMock()
+        with patch.object(client.session, 'request', return_value=self._response()):
+            client._make_request('/JSON/core/view/version/')
+        self.assertEqual(client.debug.call_count, 2)
+        client.debug = None
+        client.debug('ignored')
+
+    def test_logs_with_callback(self):
+        messages = []
+        client = ZAPAPIClient('http://localhost:8080', debug_callback=messages.append)
+        with patch.object(client.session, 'request', return_value=self._response()):
+            client._make_request('/JSON/core/view/version/')
+        self.assertEqual(len(messages), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
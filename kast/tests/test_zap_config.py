@@ -9,12 +9,13 @@ This test verifies that the ZAP plugin properly:
 
 import os
 import unittest
-from unittest.mock import Mock
+from unittest.mock import Mock, patch
 
 import pytest
 
 from kast.config_manager import ConfigManager
 from kast.plugins.zap_plugin import ZapPlugin
+from kast.scripts.zap_providers import LocalZapProvider, RemoteZapProvider
 
 
 class TestZapConfig(unittest.TestCase):
@@ -247,3 +248,17 @@ class TestZapConfig(unittest.TestCase):
         self.assertEqual(plugin.priority, 200)
         self.assertIsNotNone(plugin.description)
         self.assertIsNotNone(plugin.website_url)
+
+    def test_select_provider_class(self):
+        """Test execution_mode dispatch to provider classes."""
+        plugin = ZapPlugin(self.cli_args, self.config_manager)
+        plugin.config = {}
+
+        self.assertIs(plugin._select_provider_class('local'), LocalZapProvider)
+        self.assertIs(plugin._select_provider_class('remote'), RemoteZapProvider)
+        self.assertIs(plugin._select_provider_class('cloud'), LocalZapProvider)
+
+        with patch.dict(os.environ, {'KAST_ZAP_URL': 'http://zap:8080'}):
+            self.assertIs(plugin._select_provider_class('auto'), RemoteZapProvider)
+            plugin.config = {'auto_discovery': {'check_env_vars': False}}
+            self.assertIs(plugin._select_provider_class('auto'), LocalZapProvider)
@@ -0,0 +1,599 @@
+"""
+Tests for the local/remote ZAP instance providers in kast.scripts.zap_providers.
+"""
+
+import json
+import os
+import socket
+import socketserver
+import subprocess
+import sys
+import tempfile
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+from urllib.parse import quote
+
+from kast.scripts import zap_providers
+from kast.scripts.zap_providers import (
+    LocalZapProvider,
+    RemoteZapProvider,
+    ZapInstanceProvider,
+    _DockerSocket,
+    _LocalCfg,
+    _parse_memory_limit,
+    _run_with_pidfd,
+    _wait_for_port,
+    render_automation_plan,
+    substitute_plan_variables,
+)
+
+
+class TestLocalCfg(unittest.TestCase):
+
+    def test_defaults_when_local_section_missing(self):
+        cfg = _LocalCfg.from_config({})
+        self.assertEqual(cfg.docker_image, 'ghcr.io/zaproxy/zaproxy:stable')
+        self.assertEqual(cfg.api_port, 8080)
+        self.assertEqual(cfg.api_key, 'kast-local')
+        self.assertTrue(cfg.auto_start)
+        self.assertFalse(cfg.cleanup_on_completion)
+
+    def test_overrides_and_unknown_keys(self):
+        cfg = _LocalCfg.from_config({'local': {
+            'api_port': 9090,
+            'container_name': 'zap-test',
+            'use_automation_framework': False,
+        }})
+        self.assertEqual(cfg.api_port, 9090)
+        self.assertEqual(cfg.container_name, 'zap-test')
+        self.assertEqual(cfg.api_key, 'kast-local')
+
+    def test_provider_resolves_config_once(self):
+        provider = LocalZapProvider({'local': {'cleanup_on_completion': True}})
+        self.assertTrue(provider.local_cfg.cleanup_on_completion)
+        with self.assertRaises(AttributeError):
+            provider.local_cfg.api_port = 1
+
+
+class TestRenderAutomationPlan(unittest.TestCase):
+
+    PLAN = (
+        'env:\n'
+        '  contexts:\n'
+        '    - urls: ["${TARGET_URL}"]\n'
+        '      includePaths: ["${TARGET_URL}.*"]\n'
+        '      other: "${TARGET_URL_ALT} $$ ^x$"\n'
+    )
+
+    def test_matches_str_replace(self):
+        for target in ('https://example.com', 'http://a.test:8443/app'):
+            self.assertEqual(
+                render_automation_plan(self.PLAN, target),
+                self.PLAN.replace('${TARGET_URL}', target),
+            )
+
+    def test_plan_without_placeholder_unchanged(self):
+        self.assertEqual(render_automation_plan('jobs: []\n', 'https://x'), 'jobs: []\n')
+
+    def test_multiple_variables_single_pass(self):
+        plan = 'a: ${TARGET_URL}\nb: ${SCAN_NAME}\nc: ${UNKNOWN}\n'
+        rendered = substitute_plan_variables(plan, {'TARGET_URL': '${SCAN_NAME}', 'SCAN_NAME': 'nightly'})
+        self.assertEqual(rendered, 'a: ${SCAN_NAME}\nb: nightly\nc: ${UNKNOWN}\n')
+
+
+class TestLocalUploadAutomationPlan(unittest.TestCase):
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.provider = LocalZapProvider({})
+        self.provider.temp_config_dir = Path(self._tmp.name)
+        self.provider.zap_client = MagicMock()
+        self.provider.zap_client.upload_file.return_value = {'Uploaded': '/zap/kast_automation_plan.yaml'}
+        self.provider.zap_client.run_automation_plan.return_value = {'planId': 1}
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_uploads_rendered_plan_and_writes_copy(self):
+        self.assertEqual(self.provider.upload_automation_plan('u: ${TARGET_URL}\n', 'https://t'), 1)
+        plan_path = self.provider.temp_config_dir / 'automation_plan.yaml'
+        self.assertEqual(plan_path.read_text(), 'u: https://t\n')
+        self.provider.zap_client.upload_file.assert_called_once_with(b'u: https://t\n', 'kast_automation_plan.yaml')
+        self.provider.zap_client.run_automation_plan.assert_called_once_with('/zap/kast_automation_plan.yaml')
+
+    def test_identical_plan_not_rewritten(self):
+        with patch.object(Path, 'write_bytes', autospec=True, side_effect=Path.write_bytes) as write:
+            self.provider.upload_automation_plan('u: ${TARGET_URL}\n', 'https://t')
+            self.provider.upload_automation_plan('u: ${TARGET_URL}\n', 'https://t')
+        self.assertEqual(write.call_count, 1)
+
+
+class TestSharedClient(unittest.TestCase):
+
+    def setUp(self):
+        ZapInstanceProvider._client_by_url.clear()
+
+    def tearDown(self):
+        ZapInstanceProvider._client_by_url.clear()
+
+    def test_same_url_and_key_share_client(self):
+        first = LocalZapProvider({})._get_client('http://localhost:8080', 'k')
+        second = RemoteZapProvider({})._get_client('http://localhost:8080', 'k')
+        self.assertIs(first, second)
+
+    def test_different_timeout_gets_new_client(self):
+        first = LocalZapProvider({})._get_client('http://localhost:8080', 'k')
+        second = RemoteZapProvider({})._get_client('http://localhost:8080', 'k', timeout=60)
+        self.assertIsNot(first, second)
+        self.assertEqual(first.timeout, 30)
+        self.assertEqual(second.timeout, 60)
+
+    def test_remote_cleanup_leaves_shared_client_open(self):
+        provider = RemoteZapProvider({})
+        provider.zap_client = provider._get_client('http://localhost:8080', 'k')
+        with patch.object(provider.zap_client, 'close') as close:
+            provider.cleanup()
+        close.assert_not_called()
+
+    def test_different_key_gets_new_client(self):
+        provider = LocalZapProvider({})
+        self.assertIsNot(
+            provider._get_client('http://localhost:8080', 'a'),
+            provider._get_client('http://localhost:8080', 'b'),
+        )
+
+
+class TestLocalProvision(unittest.TestCase):
+
+    def setUp(self):
+        self.provider = LocalZapProvider({})
+        self.client = MagicMock()
+        self.client.wait_for_ready.return_value = True
+        patch.object(self.provider, '_get_client', return_value=self.client).start()
+        patch('kast.scripts.zap_providers._wait_for_port', return_value=True).start()
+        patch.object(self.provider, '_image_present', return_value=True).start()
+        self.addCleanup(patch.stopall)
+
+    def test_docker_unavailable(self):
+        with patch.object(self.provider, '_check_docker_available', return_value=False), \
+                patch.object(self.provider, '_find_running_zap_container', return_value=None):
+            success, client, info = self.provider.provision('https://t', '/tmp')
+        self.assertFalse(success)
+        self.assertEqual(info, {"error": "Docker not available"})
+
+    def test_reuses_existing_container(self):
+        with patch.object(self.provider, '_check_docker_available', return_value=True), \
+                patch.object(self.provider, '_find_running_zap_container', return_value='zap1'), \
+                patch.object(self.provider, '_start_zap_container') as start:
+            success, client, info = self.provider.provision('https://t', '/tmp')
+        self.assertTrue(success)
+        self.assertIs(client, self.client)
+        self.assertEqual(info['container_name'], 'zap1')
+        self.assertFalse(info['started_by_kast'])
+        start.assert_not_called()
+        self.client.probe_ready_once.assert_called_once()
+        self.client.wait_for_ready.assert_not_called()
+
+    def test_existing_container_not_ready_falls_back_to_wait(self):
+        self.client.probe_ready_once.return_value = False
+        with patch.object(self.provider, '_check_docker_available', return_value=True), \
+                patch.object(self.provider, '_find_running_zap_container', return_value='zap1'):
+            success, _, _ = self.provider.provision('https://t', '/tmp')
+        self.assertTrue(success)
+        self.client.wait_for_ready.assert_called_once()
+
+    def test_pulls_missing_image_before_start(self):
+        self.provider._image_present.return_value = False
+        with patch.object(self.provider, '_check_docker_available', return_value=True), \
+                patch.object(self.provider, '_find_running_zap_container', return_value=None), \
+                patch.object(self.provider, '_pull_image', return_value=False) as pull, \
+                patch.object(self.provider, '_start_zap_container') as start:
+            success, _, info = self.provider.provision('https://t', '/tmp')
+        self.assertFalse(success)
+        self.assertIn('Failed to pull', info['error'])
+        pull.assert_called_once()
+        start.assert_not_called()
+
+
+class TestRemoteResolveEndpoint(unittest.TestCase):
+
+    def test_config_values_expanded(self):
+        provider = RemoteZapProvider({'remote': {'api_url': 'http://${ZAP_HOST}:8080', 'api_key': '$ZAP_KEY'}})
+        with patch.dict(os.environ, {'ZAP_HOST': 'zap.test', 'ZAP_KEY': 'secret'}):
+            self.assertEqual(provider._resolve_endpoint(), ('http://zap.test:8080', 'secret', 30))
+
+    def test_env_fallback_resolved_once(self):
+        provider = RemoteZapProvider({'remote': {'timeout_seconds': 5}})
+        with patch.dict(os.environ, {'KAST_ZAP_URL': 'http://a:8080', 'KAST_ZAP_API_KEY': 'k'}):
+            self.assertEqual(provider._resolve_endpoint(), ('http://a:8080', 'k', 5))
+        with patch.dict(os.environ, {'KAST_ZAP_URL': 'http://b:8080'}):
+            self.assertEqual(provider._resolve_endpoint()[0], 'http://a:8080')
+
+    def test_missing_url_fails_provision(self):
+        with patch.dict(os.environ, {}, clear=True):
+            success, client, info = RemoteZapProvider({}).provision('https://t', '/tmp')
+        self.assertFalse(success)
+        self.assertIn('no api_url configured', info['error'])
+
+
+class TestFindRunningZapContainer(unittest.TestCase):
+
+    def setUp(self):
+        zap_providers.invalidate_docker_cache()
+        patch.object(zap_providers, '_get_docker_api', return_value=None).start()
+        patch.object(zap_providers, '_known_container', None).start()
+        self.addCleanup(patch.stopall)
+        self.addCleanup(zap_providers.invalidate_docker_cache)
+
+    def _fake_docker(self, output):
+        real_popen = subprocess.Popen
+        return patch('kast.scripts.zap_providers.subprocess.Popen',
+                     side_effect=lambda cmd, **kw: real_popen(['printf', output], **kw))
+
+    def test_returns_first_name(self):
+        with self._fake_docker('id1 zap-one\\nid2 zap-two\\n'):
+            self.assertEqual(LocalZapProvider({})._find_running_zap_container(), 'zap-one')
+        self.assertEqual(zap_providers._known_container, ('id1', 'zap-one'))
+
+    def test_known_container_confirmed_by_inspect(self):
+        zap_providers._known_container = ('id1', 'zap-one')
+        with patch('kast.scripts.zap_providers._run_with_pidfd',
+                   return_value=MagicMock(stdout='true\n')) as inspect, \
+                patch('kast.scripts.zap_providers.subprocess.Popen') as popen:
+            self.assertEqual(LocalZapProvider({})._find_running_zap_container(), 'zap-one')
+        self.assertEqual(inspect.call_args.args[0][-1], 'id1')
+        popen.assert_not_called()
+
+    def test_stopped_known_container_falls_back_to_query(self):
+        zap_providers._known_container = ('id1', 'zap-old')
+        with patch('kast.scripts.zap_providers._run_with_pidfd',
+                   return_value=MagicMock(stdout='false\n')), \
+                self._fake_docker('id2 zap-new\\n'):
+            self.assertEqual(LocalZapProvider({})._find_running_zap_container(), 'zap-new')
+        self.assertEqual(zap_providers._known_container, ('id2', 'zap-new'))
+
+    def test_no_containers(self):
+        with self._fake_docker(''):
+            self.assertIsNone(LocalZapProvider({})._find_running_zap_container())
+
+    def test_falls_back_to_image_filter(self):
+        real_popen = subprocess.Popen
+        outputs = iter(['', 'id9 third-party-zap\\n'])
+        commands = []
+
+        def fake_popen(cmd, **kw):
+            commands.append(cmd)
+            return real_popen(['printf', next(outputs)], **kw)
+
+        with patch('kast.scripts.zap_providers.subprocess.Popen', side_effect=fake_popen):
+            self.assertEqual(LocalZapProvider({})._find_running_zap_container(), 'third-party-zap')
+        self.assertEqual([c[3] for c in commands], ['label=kast-zap=1', 'ancestor=ghcr.io/zaproxy/zaproxy'])
+
+    def test_docker_missing(self):
+        with patch('kast.scripts.zap_providers.subprocess.Popen', side_effect=FileNotFoundError):
+            self.assertIsNone(LocalZapProvider({})._find_running_zap_container())
+
+
+class TestLocalDownloadResults(unittest.TestCase):
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.output_dir = self._tmp.name
+        self.provider = LocalZapProvider({})
+        self.provider.zap_client = MagicMock()
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_returns_mounted_report(self):
+        reports_dir = Path(self.output_dir) / 'zap_reports'
+        reports_dir.mkdir()
+        (reports_dir / 'zap_report.json').write_text('{}')
+        path = self.provider.download_results(self.output_dir, 'zap_report.json')
+        self.assertEqual(path, str(reports_dir / 'zap_report.json'))
+        self.provider.zap_client.generate_report.assert_not_called()
+
+    def test_generates_via_api_when_missing(self):
+        path = self.provider.download_results(self.output_dir, 'zap_report.json')
+        self.assertEqual(path, str(Path(self.output_dir) / 'zap_report.json'))
+        self.provider.zap_client.generate_report.assert_called_once_with(path, 'json')
+
+
+class TestWaitForPort(unittest.TestCase):
+
+    def test_listening_port(self):
+        with socket.socket() as server:
+            server.bind(('127.0.0.1', 0))
+            server.listen()
+            self.assertTrue(_wait_for_port('127.0.0.1', server.getsockname()[1], timeout=2))
+
+    def test_closed_port_times_out(self):
+        with socket.socket() as probe:
+            probe.bind(('127.0.0.1', 0))
+            port = probe.getsockname()[1]
+        self.assertFalse(_wait_for_port('127.0.0.1', port, timeout=0.3))
+
+    def test_falls_through_to_later_addresses(self):
+        # localhost resolving to ::1 first while the listener is IPv4-only
+        with socket.socket() as closed:
+            closed.bind(('127.0.0.1', 0))
+            dead_port = closed.getsockname()[1]
+        with socket.socket() as server:
+            server.bind(('127.0.0.1', 0))
+            server.listen()
+            port = server.getsockname()[1]
+            addrinfos = [
+                (socket.AF_INET, socket.SOCK_STREAM, 6, '', ('127.0.0.1', dead_port)),
+                (socket.AF_INET, socket.SOCK_STREAM, 6, '', ('127.0.0.1', port)),
+            ]
+            with patch('socket.getaddrinfo', return_value=addrinfos):
+                self.assertTrue(_wait_for_port('localhost', port, timeout=2))
+
+
+class TestRunWithPidfd(unittest.TestCase):
+
+    def test_captures_output(self):
+        result = _run_with_pidfd(['sh', '-c', 'echo out; echo err >&2; exit 3'], timeout=5)
+        self.assertEqual((result.returncode, result.stdout, result.stderr), (3, 'out\n', 'err\n'))
+
+    def test_kills_on_timeout(self):
+        with self.assertRaises(subprocess.TimeoutExpired):
+            _run_with_pidfd(['sleep', '5'], timeout=0.2)
+
+    def test_output_larger_than_pipe_buffer(self):
+        result = _run_with_pidfd([sys.executable, '-c', "print('x' * 200000)"], timeout=5)
+        self.assertEqual(result.returncode, 0)
+        self.assertEqual(len(result.stdout), 200001)
+
+
+class TestDockerProbeCache(unittest.TestCase):
+
+    def setUp(self):
+        zap_providers.invalidate_docker_cache()
+        patch.object(zap_providers, '_docker_available', None).start()
+        patch.object(zap_providers, '_get_docker_api', return_value=None).start()
+        patch.object(zap_providers, '_known_container', None).start()
+        self.addCleanup(patch.stopall)
+        self.addCleanup(zap_providers.invalidate_docker_cache)
+
+    def test_docker_version_checked_once(self):
+        with patch('kast.scripts.zap_providers._run_with_pidfd',
+                   return_value=MagicMock(returncode=0)) as run:
+            self.assertTrue(LocalZapProvider({})._check_docker_available())
+            self.assertTrue(LocalZapProvider({})._check_docker_available())
+        run.assert_called_once()
+
+    def test_docker_unavailable_not_cached(self):
+        with patch('kast.scripts.zap_providers._run_with_pidfd',
+                   side_effect=[MagicMock(returncode=1), MagicMock(returncode=0)]) as run:
+            self.assertFalse(LocalZapProvider({})._check_docker_available())
+            self.assertTrue(LocalZapProvider({})._check_docker_available())
+        self.assertEqual(run.call_count, 2)
+
+    def test_container_lookup_cached_within_ttl(self):
+        provider = LocalZapProvider({})
+        with patch.object(provider, '_query_running_zap_container', return_value='zap1') as query:
+            self.assertEqual(provider._find_running_zap_container(), 'zap1')
+            self.assertEqual(provider._find_running_zap_container(), 'zap1')
+            query.assert_called_once()
+
+            zap_providers.invalidate_docker_cache()
+            provider._find_running_zap_container()
+            self.assertEqual(query.call_count, 2)
+
+    def test_container_lookup_expires(self):
+        provider = LocalZapProvider({})
+        with patch.object(provider, '_query_running_zap_container', return_value='') as query, \
+                patch('kast.scripts.zap_providers.time.monotonic', side_effect=[100.0, 103.0, 103.0]):
+            self.assertIsNone(provider._find_running_zap_container())
+            self.assertIsNone(provider._find_running_zap_container())
+        self.assertEqual(query.call_count, 2)
+
+
+
+class _FakeEngineHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def _reply(self, status, body=None):
+        data = json.dumps(body).encode() if body is not None else b''
+        self.send_response(status)
+        if body is not None:
+            self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _record(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        body = json.loads(self.rfile.read(length)) if length else None
+        self.server.calls.append((self.command, self.path, body))
+
+    def do_GET(self):
+        self._record()
+        if self.path.startswith('/images/'):
+            self._reply(404, {'message': 'No such image'})
+        elif self.path.startswith('/containers/abc/json'):
+            self._reply(200, self.server.inspect_body)
+        elif self.path == '/_ping':
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/plain')
+            self.send_header('Content-Length', '2')
+            self.end_headers()
+            self.wfile.write(b'OK')
+        else:
+            self._reply(200, [{'Id': 'abc', 'Names': ['/zap-running']}])
+
+    def do_POST(self):
+        self._record()
+        if self.path.startswith('/images/create'):
+            data = self.server.pull_output
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+        elif self.path.startswith('/containers/create'):
+            self._reply(201, {'Id': 'abc123', 'Warnings': []})
+        else:
+            self._reply(204)
+
+    def do_DELETE(self):
+        self._record()
+        status = self.server.delete_status
+        self._reply(status, {'message': 'conflict'} if status != 204 else None)
+
+    def log_message(self, *args):
+        pass
+
+
+class _FakeEngine(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+class TestDockerSocketRetry(unittest.TestCase):
+
+    def _connection(self):
+        conn = MagicMock()
+        conn.request.side_effect = [ConnectionResetError(), None]
+        conn.getresponse.return_value = MagicMock(status=200, read=MagicMock(return_value=b''),
+                                                  getheader=MagicMock(return_value=''))
+        return patch.object(zap_providers, '_UnixHTTPConnection', return_value=conn)
+
+    def test_get_retried_after_dropped_keepalive(self):
+        with self._connection():
+            self.assertEqual(_DockerSocket('/nonexistent').get('/_ping'), (200, b''))
+
+    def test_post_not_retried(self):
+        with self._connection() as conn_cls, self.assertRaises(OSError):
+            _DockerSocket('/nonexistent').post('/containers/abc/start')
+        conn_cls.return_value.request.assert_called_once()
+
+
+class TestDockerSocket(unittest.TestCase):
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        socket_path = os.path.join(self._tmp.name, 'docker.sock')
+        self.server = _FakeEngine(socket_path, _FakeEngineHandler)
+        self.server.calls = []
+        self.server.pull_output = b'{"status":"Pulling"}\n{"status":"Downloaded newer image"}\n'
+        self.server.delete_status = 204
+        self.server.inspect_body = {'Name': '/zap-running', 'State': {'Running': True}}
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+
+        zap_providers.invalidate_docker_cache()
+        patch.object(zap_providers, '_docker_available', None).start()
+        patch.object(zap_providers, '_get_docker_api', return_value=_DockerSocket(socket_path)).start()
+        patch.object(zap_providers, '_known_container', None).start()
+        self.run_cli = patch('kast.scripts.zap_providers._run_with_pidfd').start()
+        self.addCleanup(patch.stopall)
+        self.addCleanup(zap_providers.invalidate_docker_cache)
+
+    def test_ping_and_container_lookup(self):
+        provider = LocalZapProvider({})
+        self.assertTrue(provider._check_docker_available())
+        self.assertEqual(provider._query_running_zap_container(), 'zap-running')
+        self.assertEqual(self.server.calls[1][1], '/containers/json?filters=' + quote('{"label": ["kast-zap=1"]}'))
+        self.run_cli.assert_not_called()
+
+    def test_known_container_inspected_by_id(self):
+        provider = LocalZapProvider({})
+        self.assertEqual(provider._find_running_zap_container(), 'zap-running')
+        zap_providers.invalidate_docker_cache()
+        self.assertEqual(provider._find_running_zap_container(), 'zap-running')
+        self.assertEqual([path for _, path, _ in self.server.calls][-1], '/containers/abc/json')
+        self.assertEqual(sum(path.startswith('/containers/json') for _, path, _ in self.server.calls), 1)
+
+    def test_unexpected_inspect_body_falls_back_to_cli(self):
+        self.server.inspect_body = {'message': 'unexpected'}
+        self.run_cli.return_value = MagicMock(stdout='true\n')
+        provider = LocalZapProvider({})
+        with patch.object(zap_providers, '_known_container', ('abc', 'zap-running')):
+            self.assertEqual(provider._inspect_known_container(), 'zap-running')
+        self.run_cli.assert_called_once_with(
+            ['docker', 'inspect', '-f', '{{.State.Running}}', 'abc'], timeout=10)
+
+    def test_image_probe_and_pull(self):
+        provider = LocalZapProvider({})
+        self.assertFalse(provider._image_present())
+        self.assertEqual(self.server.calls[0][1], '/images/ghcr.io/zaproxy/zaproxy%3Astable/json')
+        self.assertTrue(provider._pull_image())
+        self.assertEqual(self.server.calls[1][1], '/images/create?fromImage=ghcr.io%2Fzaproxy%2Fzaproxy%3Astable')
+
+        self.run_cli.assert_not_called()
+
+    def test_pull_error_falls_back_to_cli(self):
+        self.server.pull_output = b'{"status":"Pulling"}\n{"error":"unauthorized"}\n'
+        self.run_cli.return_value = MagicMock(returncode=0)
+        self.assertTrue(LocalZapProvider({})._pull_image())
+        self.run_cli.assert_called_once_with(['docker', 'pull', 'ghcr.io/zaproxy/zaproxy:stable'], timeout=600)
+
+        self.run_cli.return_value = MagicMock(returncode=1, stderr='denied')
+        self.assertFalse(LocalZapProvider({})._pull_image())
+
+    def _started_provider(self):
+        provider = LocalZapProvider({})
+        provider.container_name = 'kast-zap-local'
+        provider.started_container = True
+        return provider
+
+    def test_cleanup_treats_404_as_removed(self):
+        self.server.delete_status = 404
+        self._started_provider()._cleanup_container()
+        self.run_cli.assert_not_called()
+
+    def test_cleanup_falls_back_to_cli_on_api_error(self):
+        self.server.delete_status = 409
+        self.run_cli.return_value = MagicMock(returncode=0)
+        messages = []
+        provider = self._started_provider()
+        provider.debug = messages.append
+        provider._cleanup_container()
+        self.run_cli.assert_called_once_with(['docker', 'rm', '-f', 'kast-zap-local'], timeout=30)
+        self.assertTrue(any('409' in m for m in messages))
+
+    def test_start_and_cleanup(self):
+        provider = LocalZapProvider({'local': {'memory_limit': '2g', 'api_port': 9090}})
+        self.assertTrue(provider._start_zap_container(self._tmp.name))
+        provider._cleanup_container()
+
+        methods = [(method, path.split('?')[0]) for method, path, _ in self.server.calls]
+        self.assertEqual(methods, [
+            ('POST', '/containers/create'),
+            ('POST', '/containers/abc123/start'),
+            ('DELETE', '/containers/kast-zap-local'),
+        ])
+        self.assertEqual(self.server.calls[-1][1], '/containers/kast-zap-local?force=1')
+        create_body = self.server.calls[0][2]
+        self.assertEqual(create_body['HostConfig']['Memory'], 2 * 1024 ** 3)
+        self.assertEqual(create_body['HostConfig']['PortBindings'], {'8080/tcp': [{'HostPort': '9090'}]})
+        self.assertEqual(create_body['Cmd'][-4:], ['-configfile', '/zap/config/kast.properties',
+                                                   '-config', 'api.key=kast-local'])
+        properties = (Path(self._tmp.name) / 'zap_config' / 'kast.properties').read_text()
+        self.assertIn('api.filexfer=true\n', properties)
+        self.assertNotIn('api.key', properties)
+        self.assertIn('api.filexfer=true\n', properties)
+        self.assertEqual(create_body['Labels']['kast-zap'], '1')
+        self.run_cli.assert_not_called()
+
+
+class TestParseMemoryLimit(unittest.TestCase):
+
+    def test_units(self):
+        self.assertEqual(_parse_memory_limit('512m'), 512 * 1024 ** 2)
+        self.assertEqual(_parse_memory_limit('1.5GB'), int(1.5 * 1024 ** 3))
+        self.assertEqual(_parse_memory_limit('4096'), 4096)
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            _parse_memory_limit('lots')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -4,6 +4,7 @@ Test unified config system for ZAP plugin
 Verifies that ZAP plugin searches config files in the same order as ConfigManager
 """
 
+import shutil
 import tempfile
 import unittest
 from pathlib import Path
@@ -19,6 +20,7 @@ class TestZapUnifiedConfig(unittest.TestCase):
     def setUp(self):
         """Set up test fixtures"""
         self.temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.temp_dir, ignore_errors=True)
 
     @pytest.mark.xfail(
         reason="Real ZAP config search-order bug: project-level config "